@@ -10,6 +10,7 @@ from typing import List, Dict, Optional
 import joblib
 import numpy as np
 import pandas as pd
+import xgboost as xgb
 from pathlib import Path
 import json
 from datetime import datetime
@@ -22,12 +23,19 @@ DATA_DIR = Path(__file__).parent / "data"
 # Load models and metadata at startup
 # Note: XGBoost doesn't need scalers (tree-based model)
 try:
-    start_model = joblib.load(MODEL_DIR / "start_model.pkl")
-    minutes_model = joblib.load(MODEL_DIR / "minutes_model.pkl")
-
     with open(MODEL_DIR / "model_metadata.json", 'r') as f:
         metadata = json.load(f)
 
+    # XGBoost models are saved in native UBJSON; older and LightGBM models are pickles
+    if metadata['model_type'].startswith('xgboost') and (MODEL_DIR / "start_model.ubj").exists():
+        start_model = xgb.XGBClassifier()
+        start_model.load_model(MODEL_DIR / "start_model.ubj")
+        minutes_model = xgb.XGBRegressor()
+        minutes_model.load_model(MODEL_DIR / "minutes_model.ubj")
+    else:
+        start_model = joblib.load(MODEL_DIR / "start_model.pkl")
+        minutes_model = joblib.load(MODEL_DIR / "minutes_model.pkl")
+
     print("[OK] Models loaded successfully!")
     print(f"   Model version: {metadata['model_version']}")
     print(f"   Trained at: {metadata['trained_at']}")
@@ -28,19 +28,27 @@ def load_training_data():
     # Add squad depth features
     df = df.sort_values(['team', 'position', 'season', 'gameweek'])
 
-    squad_depth = []
-    for idx, row in df.iterrows():
-        recent_players = df[
-            (df['team'] == row['team']) &
-            (df['position'] == row['position']) &
-            (df['season'] == row['season']) &
-            (df['gameweek'] >= row['gameweek'] - 5) &
-            (df['gameweek'] < row['gameweek']) &
-            (df['minutes'] > 0)
-        ]['fpl_id'].nunique()
-        squad_depth.append(recent_players)
-
-    df['squad_depth_position'] = squad_depth
+    # Index played appearances once so each 5-GW window is a slice of the
+    # sorted MultiIndex instead of five boolean masks over the full frame
+    group_cols = ['team', 'position', 'season', 'gameweek']
+    played = (
+        df.loc[df['minutes'] > 0, group_cols + ['fpl_id']]
+        .set_index(group_cols)
+        .sort_index()
+    )
+
+    # Rows sharing (team, position, season, gameweek) share a window
+    depth_by_key = {}
+    for team, position, season, gameweek in df[group_cols].drop_duplicates().itertuples(index=False):
+        try:
+            window = played.loc[(team, position, season, slice(gameweek - 5, gameweek - 1)), 'fpl_id']
+            depth_by_key[(team, position, season, gameweek)] = window.nunique()
+        except KeyError:
+            depth_by_key[(team, position, season, gameweek)] = 0
+
+    df['squad_depth_position'] = [
+        depth_by_key[key] for key in zip(df['team'], df['position'], df['season'], df['gameweek'])
+    ]
     df['high_squad_depth'] = (df['squad_depth_position'] >= 3).astype(int)
 
     # Add manager profiles
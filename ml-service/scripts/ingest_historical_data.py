@@ -11,10 +11,15 @@ Why only 2 seasons?
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import io
 import json
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import time
 
 # GitHub repo with historical FPL data
@@ -27,6 +32,25 @@ SEASONS = ["2024-25", "2025-26"]
 DATA_DIR = Path(__file__).parent.parent / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Shared HTTP session: reuses pooled connections (no TLS handshake per player)
+# and retries transient failures / rate limiting with backoff
+REQUEST_TIMEOUT = 10
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+
+def read_remote_csv(url: str, **kwargs) -> pd.DataFrame:
+    """
+    Download a CSV through the shared session and parse it with pandas.
+    """
+    response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return pd.read_csv(io.StringIO(response.text), **kwargs)
+
 
 def fetch_fpl_current_season() -> pd.DataFrame:
     """
@@ -39,7 +63,9 @@ def fetch_fpl_current_season() -> pd.DataFrame:
     print("Fetching current season (2025-26) from FPL API...", flush=True)
 
     # Get bootstrap data for player/team mapping
-    bootstrap = requests.get("https://fantasy.premierleague.com/api/bootstrap-static/").json()
+    bootstrap = SESSION.get(
+        "https://fantasy.premierleague.com/api/bootstrap-static/", timeout=REQUEST_TIMEOUT
+    ).json()
 
     # Create lookup maps
     team_map = {t['id']: t['name'] for t in bootstrap['teams']}
@@ -61,8 +87,9 @@ def fetch_fpl_current_season() -> pd.DataFrame:
 
         try:
             # Fetch player history
-            response = requests.get(
-                f"https://fantasy.premierleague.com/api/element-summary/{player_id}/"
+            response = SESSION.get(
+                f"https://fantasy.premierleague.com/api/element-summary/{player_id}/",
+                timeout=REQUEST_TIMEOUT,
             )
 
             if response.status_code != 200:
@@ -136,7 +163,7 @@ def fetch_historical_season(season: str) -> pd.DataFrame:
     players_url = f"{GITHUB_BASE}/{season}/players_raw.csv"
 
     try:
-        players_df = pd.read_csv(players_url)
+        players_df = read_remote_csv(players_url)
         print(f"  [OK] Downloaded players_raw.csv ({len(players_df)} players)", flush=True)
     except Exception as e:
         print(f"  [WARNING]  Failed to download: {e}", flush=True)
@@ -154,7 +181,7 @@ def fetch_historical_season(season: str) -> pd.DataFrame:
 
     try:
         # Skip bad lines in CSV (some rows have corrupted data)
-        gw_df = pd.read_csv(merged_url, on_bad_lines='skip', engine='python')
+        gw_df = read_remote_csv(merged_url, on_bad_lines='skip', engine='python')
         print(f"  [OK] Downloaded merged_gw.csv ({len(gw_df)} appearances)", flush=True)
 
         # Standardize column names
@@ -202,7 +229,7 @@ def add_position_and_team(df: pd.DataFrame, season: str) -> pd.DataFrame:
     players_url = f"{GITHUB_BASE}/{season}/players_raw.csv"
 
     try:
-        players_df = pd.read_csv(players_url)
+        players_df = read_remote_csv(players_url)
 
         # Create position map
         position_map = {1: 'GK', 2: 'DEF', 3: 'MID', 4: 'FWD'}
@@ -210,7 +237,7 @@ def add_position_and_team(df: pd.DataFrame, season: str) -> pd.DataFrame:
 
         # Get team names
         teams_url = f"{GITHUB_BASE}/{season}/teams.csv"
-        teams_df = pd.read_csv(teams_url)
+        teams_df = read_remote_csv(teams_url)
         team_map = dict(zip(teams_df['id'], teams_df['name']))
         players_df['team'] = players_df['team'].map(team_map)
 
@@ -234,26 +261,45 @@ def add_position_and_team(df: pd.DataFrame, season: str) -> pd.DataFrame:
         return df
 
 
-def create_training_dataset() -> pd.DataFrame:
+def summarize_season(df: pd.DataFrame) -> Dict:
+    """
+    Compute summary stats for a single season's frame while it is still small.
+
+    Returns:
+        Dict with appearance count, max gameweek, position counts and player IDs
+    """
+    return {
+        'appearances': len(df),
+        'max_gameweek': int(df['gameweek'].max()),
+        'positions': df['position'].value_counts().to_dict() if 'position' in df.columns else {},
+        'player_ids': set(df['fpl_id'].unique()),
+    }
+
+
+def create_training_dataset() -> Tuple[pd.DataFrame, Dict[str, Dict]]:
     """
     Fetch 2 recent seasons and combine into single training dataset.
 
     Returns:
-        Combined DataFrame ready for feature engineering
+        Tuple of (combined DataFrame ready for feature engineering,
+                  per-season stats dict keyed by season)
     """
     all_seasons = []
+    season_stats = {}
 
     # Fetch 2024-25 (full season) from GitHub
     df_2024 = fetch_historical_season("2024-25")
     if not df_2024.empty:
         df_2024 = add_position_and_team(df_2024, "2024-25")
         all_seasons.append(df_2024)
+        season_stats["2024-25"] = summarize_season(df_2024)
         print(f"  [OK] 2024-25: {len(df_2024)} appearances")
 
     # Fetch current season (2025-26) from live API
     current_df = fetch_fpl_current_season()
     if not current_df.empty:
         all_seasons.append(current_df)
+        season_stats["2025-26"] = summarize_season(current_df)
         print(f"  [OK] 2025-26: {len(current_df)} appearances")
 
     # Combine all seasons
@@ -265,29 +311,38 @@ def create_training_dataset() -> pd.DataFrame:
     # Sort by player and date
     combined_df = combined_df.sort_values(['fpl_id', 'season', 'gameweek'])
 
+    unique_players = set().union(*(stats['player_ids'] for stats in season_stats.values()))
+
     print(f"\n[OK] Combined dataset: {len(combined_df)} total appearances")
-    print(f"   Players: {combined_df['fpl_id'].nunique()}")
-    print(f"   Seasons: {combined_df['season'].unique()}")
+    print(f"   Players: {len(unique_players)}")
+    print(f"   Seasons: {list(season_stats)}")
 
-    return combined_df
+    return combined_df, season_stats
 
 
-def save_training_data(df: pd.DataFrame):
+def save_training_data(df: pd.DataFrame, season_stats: Dict[str, Dict]):
     """
     Save processed data to CSV for ML training.
+
+    Summary stats are merged from the per-season stats computed at fetch time
+    instead of re-scanning the combined frame.
     """
     output_path = DATA_DIR / "training_data_raw.csv"
     df.to_csv(output_path, index=False)
     print(f"\n[SAVED] Saved to: {output_path}")
 
+    positions = Counter()
+    for stats in season_stats.values():
+        positions.update(stats['positions'])
+
     # Also save summary stats
     summary = {
-        'total_appearances': len(df),
-        'unique_players': df['fpl_id'].nunique(),
-        'seasons': df['season'].unique().tolist(),
-        'gameweeks_per_season': df.groupby('season')['gameweek'].max().to_dict(),
-        'positions': df['position'].value_counts().to_dict(),
-        'date_generated': pd.Timestamp.now().isoformat(),
+        'total_appearances': sum(stats['appearances'] for stats in season_stats.values()),
+        'unique_players': len(set().union(*(stats['player_ids'] for stats in season_stats.values()))),
+        'seasons': list(season_stats),
+        'gameweeks_per_season': {season: stats['max_gameweek'] for season, stats in season_stats.items()},
+        'positions': {pos: int(count) for pos, count in positions.most_common()},
+        'date_generated': datetime.now().isoformat(),
     }
 
     summary_path = DATA_DIR / "dataset_summary.json"
@@ -313,10 +368,10 @@ def main():
 
     try:
         # Create combined dataset
-        df = create_training_dataset()
+        df, season_stats = create_training_dataset()
 
         # Save to disk
-        save_training_data(df)
+        save_training_data(df, season_stats)
 
         print("\n[OK] Data ingestion complete!")
         print(f"   Next step: Run feature_engineering.py to prepare training features")
@@ -15,6 +15,8 @@ from sklearn.metrics import mean_absolute_error
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.isotonic import IsotonicRegression
 
+from training_utils import squad_depth
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 MODEL_DIR = Path(__file__).parent.parent / "models"
 
@@ -34,19 +36,7 @@ def load_training_data():
     print("[BUILD] Computing squad depth...")
     df = df.sort_values(['team', 'position', 'season', 'gameweek'])
 
-    squad_depth = []
-    for idx, row in df.iterrows():
-        recent_players = df[
-            (df['team'] == row['team']) &
-            (df['position'] == row['position']) &
-            (df['season'] == row['season']) &
-            (df['gameweek'] >= row['gameweek'] - 5) &
-            (df['gameweek'] < row['gameweek']) &
-            (df['minutes'] > 0)
-        ]['fpl_id'].nunique()
-        squad_depth.append(recent_players)
-
-    df['squad_depth_position'] = squad_depth
+    df['squad_depth_position'] = squad_depth(df)
     df['high_squad_depth'] = (df['squad_depth_position'] >= 3).astype(int)
 
     # Add manager profiles
@@ -3,11 +3,21 @@ ULTIMATE PUSH: Stacked ensemble + Calibration
 Combines meta-learning with probability calibration for maximum accuracy
 """
 
+import os
+
+# Keep BLAS/OpenMP pools single-threaded when numpy and the boosters load;
+# every fit passes its thread count explicitly so nested parallelism can't oversubscribe
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
 import joblib
+from joblib import Parallel, delayed
+from numba import njit
 
 import xgboost as xgb
 import lightgbm as lgb
@@ -15,71 +25,220 @@ import catboost as cb
 
 from sklearn.model_selection import train_test_split, KFold
 from sklearn.metrics import mean_absolute_error
-from sklearn.linear_model import Ridge
-from sklearn.calibration import CalibratedClassifierCV
-from sklearn.isotonic import IsotonicRegression
+from scipy.optimize import nnls
+from sklearn.linear_model import LogisticRegression
+
+from training_utils import (
+    XGB_DEVICE, LGB_DEVICE, CAT_DEVICE, n_parallel, inner_threads, load_split_index,
+    squad_depth, cached_frame,
+)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 MODEL_DIR = Path(__file__).parent.parent / "models"
 
+# Native-API params for the minutes base learners (thread counts are set per fit)
+XGB_MINUTES_PARAMS = {
+    'max_depth': 4, 'learning_rate': 0.05,
+    'min_child_weight': 5, 'subsample': 0.8, 'colsample_bytree': 0.8,
+    'seed': 42, 'objective': 'reg:squarederror', **XGB_DEVICE,
+}
+LGB_MINUTES_PARAMS = {
+    'objective': 'regression', 'max_depth': 4, 'learning_rate': 0.05,
+    'num_leaves': 15, 'subsample': 0.8,
+    'seed': 42, 'verbose': -1, **LGB_DEVICE,
+}
+CAT_MINUTES_PARAMS = {
+    'depth': 4, 'learning_rate': 0.05, 'iterations': 250,
+    'random_state': 42, 'verbose': False, **CAT_DEVICE,
+}
+
+
+@njit(cache=True)
+def pava(x_sorted, y_sorted, w):
+    """
+    Pool-adjacent-violators isotonic fit on x-sorted samples.
+
+    Tied x values are pooled first, then adjacent blocks are merged until
+    block means are strictly increasing. Each block contributes its first and
+    last x as breakpoints, which reproduces sklearn's interpolation.
+
+    Returns:
+        (breaks, values) for predict_isotonic
+    """
+    n = len(x_sorted)
+    block_sum = np.empty(n)
+    block_weight = np.empty(n)
+    block_lo = np.empty(n)
+    block_hi = np.empty(n)
+    n_blocks = 0
+
+    for i in range(n):
+        if n_blocks > 0 and x_sorted[i] == block_hi[n_blocks - 1]:
+            # Pool tied x into the open block
+            block_sum[n_blocks - 1] += y_sorted[i] * w[i]
+            block_weight[n_blocks - 1] += w[i]
+        else:
+            block_sum[n_blocks] = y_sorted[i] * w[i]
+            block_weight[n_blocks] = w[i]
+            block_lo[n_blocks] = x_sorted[i]
+            block_hi[n_blocks] = x_sorted[i]
+            n_blocks += 1
+
+        if i + 1 < n and x_sorted[i + 1] == x_sorted[i]:
+            continue
+
+        # Merge backwards while the last two blocks violate monotonicity
+        while (n_blocks > 1 and block_sum[n_blocks - 2] * block_weight[n_blocks - 1]
+               >= block_sum[n_blocks - 1] * block_weight[n_blocks - 2]):
+            block_sum[n_blocks - 2] += block_sum[n_blocks - 1]
+            block_weight[n_blocks - 2] += block_weight[n_blocks - 1]
+            block_hi[n_blocks - 2] = block_hi[n_blocks - 1]
+            n_blocks -= 1
+
+    breaks = np.empty(2 * n_blocks)
+    values = np.empty(2 * n_blocks)
+    k = 0
+    for b in range(n_blocks):
+        level = block_sum[b] / block_weight[b]
+        breaks[k] = block_lo[b]
+        values[k] = level
+        k += 1
+        if block_hi[b] > block_lo[b]:
+            breaks[k] = block_hi[b]
+            values[k] = level
+            k += 1
+
+    return breaks[:k], values[:k]
+
+
+@njit(cache=True)
+def predict_isotonic(x_query, breaks, values):
+    """Interpolate between isotonic breakpoints, clipping outside the fitted range."""
+    return np.interp(x_query, breaks, values)
+
+
+def fit_isotonic(x, y):
+    """Fit an isotonic calibrator, returned as its (breaks, values) arrays."""
+    x = np.asarray(x, dtype=np.float64)
+    order = np.argsort(x, kind='mergesort')
+    breaks, values = pava(x[order], np.asarray(y, dtype=np.float64)[order], np.ones(len(x)))
+    return {'breaks': breaks, 'values': values}
+
+
+def fit_nnls_blend(X_meta, y):
+    """
+    Solve the non-negative least squares blend of the base-learner columns.
+
+    Returns:
+        Weights summing to one; the blend is X_meta @ weights
+    """
+    weights, _ = nnls(np.asarray(X_meta, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    total = weights.sum()
+    return weights / total if total > 0 else np.full(len(weights), 1 / len(weights))
+
+
+def fit_calibrated(model, X_fit, y_fit, X_cal, y_cal):
+    """
+    Fit a classifier once, then Platt-scale it on the calibration split.
+
+    Returns:
+        (model, platt), where platt holds the sigmoid's coef and intercept
+    """
+    model.fit(X_fit, y_fit)
+    raw = model.predict_proba(X_cal)[:, 1]
+    platt = LogisticRegression().fit(raw.reshape(-1, 1), y_cal)
+    return model, {'coef': float(platt.coef_[0, 0]), 'intercept': float(platt.intercept_[0])}
+
+
+def predict_calibrated(model, platt, X):
+    """Platt-scaled P(start) from a classifier and its sigmoid parameters."""
+    raw = model.predict_proba(X)[:, 1]
+    return 1.0 / (1.0 + np.exp(-(platt['coef'] * raw + platt['intercept'])))
+
+
+def fit_minutes_fold(X_train, y_train, train_idx, val_idx, xgb_ref, lgb_full, oof, n_threads):
+    """
+    Fit the three minutes base learners on one CV fold and write their
+    (xgb, lgb, cat) predictions for val_idx into the columns of `oof`.
+
+    XGBoost reuses the quantile cuts of `xgb_ref` and LightGBM trains on a
+    subset of the pre-binned `lgb_full`, so features are binned once, not per fold.
+    Folds have disjoint val_idx, so concurrent writes never overlap.
+    """
+    X_fold_train = X_train.iloc[train_idx]
+    X_fold_val = X_train.iloc[val_idx]
+    y_fold_train = y_train.iloc[train_idx]
+
+    dtrain = xgb.QuantileDMatrix(X_fold_train, y_fold_train, ref=xgb_ref)
+    xgb_model = xgb.train({**XGB_MINUTES_PARAMS, 'nthread': n_threads}, dtrain, num_boost_round=200)
+
+    lgb_model = lgb.train({**LGB_MINUTES_PARAMS, 'num_threads': n_threads},
+                          lgb_full.subset(train_idx), num_boost_round=250)
+
+    cat_model = cb.CatBoostRegressor(**CAT_MINUTES_PARAMS, thread_count=n_threads)
+    cat_model.fit(X_fold_train, y_fold_train)
+
+    oof[val_idx, 0] = xgb_model.inplace_predict(X_fold_val)
+    oof[val_idx, 1] = lgb_model.predict(X_fold_val)
+    oof[val_idx, 2] = cat_model.predict(X_fold_val)
+
 
 def load_training_data():
-    """Load feature-engineered data with advanced features."""
+    """
+    Load feature-engineered data with advanced features.
+
+    The enriched frame is cached as Parquet, keyed on the CSV and this
+    script, so reruns skip the CSV parse and feature build.
+    """
     data_path = DATA_DIR / "training_data_features.csv"
     config_path = DATA_DIR / "feature_config.json"
 
-    df = pd.read_csv(data_path)
-    df = df[df['is_outlier_event'] == 0].copy()
-
     with open(config_path, 'r') as f:
         config = json.load(f)
 
+    df = cached_frame(
+        'training_enriched', lambda: build_advanced_features(pd.read_csv(data_path)),
+        data_path, Path(__file__),
+    )
+
+    # Update config
+    advanced_features = ['squad_depth_position', 'high_squad_depth',
+                         'manager_early_sub_rate', 'manager_full_game_rate',
+                         'high_rotation_manager']
+
+    config['start_features'] = config['start_features'] + advanced_features
+    config['minutes_features'] = config['minutes_features'] + advanced_features
+
+    return df, config
+
+
+def build_advanced_features(df):
+    """Drop outlier events and add squad depth and manager profile features."""
+    df = df[df['is_outlier_event'] == 0].copy()
+
     # Add squad depth features
     print("[BUILD] Computing squad depth...")
     df = df.sort_values(['team', 'position', 'season', 'gameweek'])
 
-    squad_depth = []
-    for idx, row in df.iterrows():
-        recent_players = df[
-            (df['team'] == row['team']) &
-            (df['position'] == row['position']) &
-            (df['season'] == row['season']) &
-            (df['gameweek'] >= row['gameweek'] - 5) &
-            (df['gameweek'] < row['gameweek']) &
-            (df['minutes'] > 0)
-        ]['fpl_id'].nunique()
-        squad_depth.append(recent_players)
-
-    df['squad_depth_position'] = squad_depth
+    df['squad_depth_position'] = squad_depth(df)
     df['high_squad_depth'] = (df['squad_depth_position'] >= 3).astype(int)
 
     # Add manager profiles
     print("[BUILD] Computing manager profiles...")
-    team_profiles = {}
-    for team in df['team'].unique():
-        team_data = df[df['team'] == team]
-        starters = team_data[team_data['started'] == True]
-
-        if len(starters) > 0:
-            early_sub_rate = (starters['minutes'] < 75).mean()
-            full_game_rate = (starters['minutes'] >= 85).mean()
-            team_profiles[team] = {'early_sub_rate': early_sub_rate, 'full_game_rate': full_game_rate}
-        else:
-            team_profiles[team] = {'early_sub_rate': 0.25, 'full_game_rate': 0.60}
+    starters = df.loc[df['started'] == True, ['team', 'minutes']]
+    team_profiles = (
+        starters.assign(early=starters['minutes'].lt(75), full=starters['minutes'].ge(85))
+        .groupby('team')[['early', 'full']]
+        .mean()
+        .rename(columns={'early': 'manager_early_sub_rate', 'full': 'manager_full_game_rate'})
+    )
 
-    df['manager_early_sub_rate'] = df['team'].map(lambda x: team_profiles.get(x, {}).get('early_sub_rate', 0.25))
-    df['manager_full_game_rate'] = df['team'].map(lambda x: team_profiles.get(x, {}).get('full_game_rate', 0.60))
+    # Teams without starters fall back to league-typical rates
+    df = df.join(team_profiles, on='team')
+    df = df.fillna({'manager_early_sub_rate': 0.25, 'manager_full_game_rate': 0.60})
     df['high_rotation_manager'] = (df['manager_early_sub_rate'] > 0.30).astype(int)
 
-    # Update config
-    advanced_features = ['squad_depth_position', 'high_squad_depth',
-                         'manager_early_sub_rate', 'manager_full_game_rate',
-                         'high_rotation_manager']
-
-    config['start_features'] = config['start_features'] + advanced_features
-    config['minutes_features'] = config['minutes_features'] + advanced_features
-
-    return df, config
+    return df
 
 
 def train_calibrated_stacked_ensemble(splits):
@@ -94,39 +253,40 @@ def train_calibrated_stacked_ensemble(splits):
     n_neg = (splits['start']['y_train'] == 0).sum()
     n_pos = (splits['start']['y_train'] == 1).sum()
 
-    # Train 3 base classifiers with calibration
+    # Train 3 base classifiers with calibration; they fit concurrently
+    start_threads = inner_threads(n_parallel(3))
     xgb_start = xgb.XGBClassifier(
         max_depth=4, learning_rate=0.03, n_estimators=200,
         min_child_weight=3, subsample=0.7, colsample_bytree=0.9,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, eval_metric='logloss'
+        random_state=42, eval_metric='logloss', n_jobs=start_threads, **XGB_DEVICE
     )
 
     lgb_start = lgb.LGBMClassifier(
         max_depth=6, learning_rate=0.05, n_estimators=200,
         num_leaves=31, subsample=0.8,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=-1
+        random_state=42, verbose=-1, n_jobs=start_threads, **LGB_DEVICE
     )
 
     cat_start = cb.CatBoostClassifier(
         depth=6, learning_rate=0.05, iterations=200,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=False
+        random_state=42, verbose=False, thread_count=start_threads, **CAT_DEVICE
     )
 
-    # Calibrate each classifier
-    print("    Calibrating XGBoost (Platt scaling)...")
-    xgb_calibrated = CalibratedClassifierCV(xgb_start, method='sigmoid', cv=3)
-    xgb_calibrated.fit(splits['start']['X_train'], splits['start']['y_train'])
-
-    print("    Calibrating LightGBM (Platt scaling)...")
-    lgb_calibrated = CalibratedClassifierCV(lgb_start, method='sigmoid', cv=3)
-    lgb_calibrated.fit(splits['start']['X_train'], splits['start']['y_train'])
+    # One fit per learner on 80%; the Platt sigmoid is learned on the other 20%
+    X_fit, X_cal, y_fit, y_cal = train_test_split(
+        splits['start']['X_train'], splits['start']['y_train'],
+        test_size=0.2, random_state=42, stratify=splits['start']['y_train']
+    )
 
-    print("    Calibrating CatBoost (Platt scaling)...")
-    cat_calibrated = CalibratedClassifierCV(cat_start, method='sigmoid', cv=3)
-    cat_calibrated.fit(splits['start']['X_train'], splits['start']['y_train'])
+    print("    Calibrating XGBoost, LightGBM, CatBoost (Platt scaling)...")
+    calibrated = Parallel(n_jobs=n_parallel(3), backend='loky')(
+        delayed(fit_calibrated)(model, X_fit, y_fit, X_cal, y_cal)
+        for model in (xgb_start, lgb_start, cat_start)
+    )
+    start_models, start_platt = zip(*calibrated)
 
     print("  [OK] Calibrated start models trained")
 
@@ -135,79 +295,60 @@ def train_calibrated_stacked_ensemble(splits):
 
     kf = KFold(n_splits=5, shuffle=True, random_state=42)
 
-    oof_xgb = np.zeros(len(splits['minutes']['X_train']))
-    oof_lgb = np.zeros(len(splits['minutes']['X_train']))
-    oof_cat = np.zeros(len(splits['minutes']['X_train']))
-
-    xgb_models = []
-    lgb_models = []
-    cat_models = []
-
-    for fold, (train_idx, val_idx) in enumerate(kf.split(splits['minutes']['X_train'])):
-        print(f"    Training fold {fold + 1}/5...")
-
-        X_fold_train = splits['minutes']['X_train'].iloc[train_idx]
-        X_fold_val = splits['minutes']['X_train'].iloc[val_idx]
-        y_fold_train = splits['minutes']['y_train'].iloc[train_idx]
-
-        # XGBoost
-        xgb_model = xgb.XGBRegressor(
-            max_depth=4, learning_rate=0.05, n_estimators=200,
-            min_child_weight=5, subsample=0.8, colsample_bytree=0.8,
-            random_state=42, objective='reg:squarederror'
-        )
-        xgb_model.fit(X_fold_train, y_fold_train)
-        oof_xgb[val_idx] = xgb_model.predict(X_fold_val)
-        xgb_models.append(xgb_model)
-
-        # LightGBM
-        lgb_model = lgb.LGBMRegressor(
-            max_depth=4, learning_rate=0.05, n_estimators=250,
-            num_leaves=15, subsample=0.8,
-            random_state=42, verbose=-1
-        )
-        lgb_model.fit(X_fold_train, y_fold_train)
-        oof_lgb[val_idx] = lgb_model.predict(X_fold_val)
-        lgb_models.append(lgb_model)
-
-        # CatBoost
-        cat_model = cb.CatBoostRegressor(
-            depth=4, learning_rate=0.05, iterations=250,
-            random_state=42, verbose=False
-        )
-        cat_model.fit(X_fold_train, y_fold_train)
-        oof_cat[val_idx] = cat_model.predict(X_fold_val)
-        cat_models.append(cat_model)
+    X_train = splits['minutes']['X_train']
+    y_train = splits['minutes']['y_train']
+    folds = list(kf.split(X_train))
+
+    # One float32 (n, 3) matrix of OOF predictions doubles as the meta features
+    oof = np.zeros((len(X_train), 3), dtype=np.float32)
+
+    # Bin features once; folds reuse the quantile cuts / histogram bins
+    xgb_ref = xgb.QuantileDMatrix(X_train, y_train)
+    lgb_full = lgb.Dataset(X_train, y_train, params={'verbose': -1}, free_raw_data=False).construct()
+
+    # Folds are independent: train them concurrently, splitting the cores
+    # between them. The boosters release the GIL, so threads can share the
+    # binned datasets.
+    print(f"    Training {len(folds)} folds in parallel...")
+    n_fold_jobs = n_parallel(len(folds))
+    Parallel(n_jobs=n_fold_jobs, backend='threading')(
+        delayed(fit_minutes_fold)(X_train, y_train, train_idx, val_idx, xgb_ref, lgb_full,
+                                  oof, inner_threads(n_fold_jobs))
+        for train_idx, val_idx in folds
+    )
+
+    # Fold models only exist to produce OOF predictions; test-time predictions
+    # come from one model per learner refit on the full training set
+    print("    Refitting base learners on full training set...")
+    n_threads = inner_threads(1)
+    xgb_full = xgb.train({**XGB_MINUTES_PARAMS, 'nthread': n_threads}, xgb_ref, num_boost_round=200)
+    lgb_full_model = lgb.train({**LGB_MINUTES_PARAMS, 'num_threads': n_threads}, lgb_full, num_boost_round=250)
+    cat_full = cb.CatBoostRegressor(**CAT_MINUTES_PARAMS, thread_count=n_threads)
+    cat_full.fit(X_train, y_train)
 
     # Train meta-learner on OOF predictions
     print("    Training meta-learner...")
-    X_meta = np.column_stack([oof_xgb, oof_lgb, oof_cat])
-    meta_model = Ridge(alpha=1.0)
-    meta_model.fit(X_meta, splits['minutes']['y_train'])
+    meta_weights = fit_nnls_blend(oof, y_train)
 
-    print(f"    Learned weights: XGB={meta_model.coef_[0]:.3f}, LGB={meta_model.coef_[1]:.3f}, CAT={meta_model.coef_[2]:.3f}")
+    print(f"    Learned weights: XGB={meta_weights[0]:.0%}, LGB={meta_weights[1]:.0%}, CAT={meta_weights[2]:.0%}")
 
     # Calibrate meta-learner predictions with isotonic regression
     print("    Calibrating minutes predictions (isotonic)...")
-    meta_pred_train = meta_model.predict(X_meta)
-    iso_reg = IsotonicRegression(out_of_bounds='clip')
-    iso_reg.fit(meta_pred_train, splits['minutes']['y_train'])
+    meta_pred_train = oof.astype(np.float64) @ meta_weights
+    iso_calibrator = fit_isotonic(meta_pred_train, y_train)
 
     print("  [OK] Stacked + calibrated minutes model trained")
 
     return {
-        'start_models': {
-            'xgb': xgb_calibrated,
-            'lgb': lgb_calibrated,
-            'cat': cat_calibrated,
-        },
+        'start_models': dict(zip(['xgb', 'lgb', 'cat'], start_models)),
+        'start_platt': dict(zip(['xgb', 'lgb', 'cat'], start_platt)),
         'minutes_base_models': {
-            'xgb': xgb_models,
-            'lgb': lgb_models,
-            'cat': cat_models,
+            'xgb': xgb_full,
+            'lgb': lgb_full_model,
+            'cat': cat_full,
         },
-        'minutes_meta': meta_model,
-        'minutes_calibrator': iso_reg,
+        'minutes_meta_weights': meta_weights,
+        'minutes_calibrator': iso_calibrator,
     }
 
 
@@ -221,25 +362,28 @@ def evaluate_ultimate_model(splits, models):
     actual_minutes = splits['start']['actual_test'].values
 
     # Stage 1: Calibrated ensemble predictions
-    xgb_start_proba = models['start_models']['xgb'].predict_proba(X_test)[:, 1]
-    lgb_start_proba = models['start_models']['lgb'].predict_proba(X_test)[:, 1]
-    cat_start_proba = models['start_models']['cat'].predict_proba(X_test)[:, 1]
+    xgb_start_proba, lgb_start_proba, cat_start_proba = (
+        predict_calibrated(models['start_models'][name], models['start_platt'][name], X_test)
+        for name in ('xgb', 'lgb', 'cat')
+    )
 
     # Weighted average (based on typical performance: XGB slightly better)
     start_proba = 0.4 * xgb_start_proba + 0.3 * lgb_start_proba + 0.3 * cat_start_proba
 
     # Stage 2: Stacked + calibrated minutes predictions
-    # Average predictions from all folds
-    xgb_preds = np.mean([m.predict(X_test) for m in models['minutes_base_models']['xgb']], axis=0)
-    lgb_preds = np.mean([m.predict(X_test) for m in models['minutes_base_models']['lgb']], axis=0)
-    cat_preds = np.mean([m.predict(X_test) for m in models['minutes_base_models']['cat']], axis=0)
+    base_models = models['minutes_base_models']
 
     # Meta-learner combines
-    X_meta = np.column_stack([xgb_preds, lgb_preds, cat_preds])
-    minutes_pred_raw = models['minutes_meta'].predict(X_meta)
+    X_meta = np.column_stack([
+        base_models['xgb'].inplace_predict(X_test),
+        base_models['lgb'].predict(X_test),
+        base_models['cat'].predict(X_test),
+    ])
+    minutes_pred_raw = X_meta @ models['minutes_meta_weights']
 
     # Calibrate
-    minutes_pred = models['minutes_calibrator'].predict(minutes_pred_raw)
+    calibrator = models['minutes_calibrator']
+    minutes_pred = predict_isotonic(minutes_pred_raw, calibrator['breaks'], calibrator['values'])
     minutes_pred = np.clip(minutes_pred, 0, 90)
 
     # Combined xMins
@@ -248,8 +392,10 @@ def evaluate_ultimate_model(splits, models):
     # Calculate MAE
     mae = mean_absolute_error(actual_minutes, xmins_predicted)
 
-    # Calculate accuracy at thresholds
+    # Calculate accuracy at all thresholds in one broadcast over the errors
     thresholds = [15, 20, 25, 30]
+    abs_error = np.abs(actual_minutes - xmins_predicted)
+    accuracies = (abs_error[:, None] <= np.asarray(thresholds)[None, :]).mean(axis=0)
     accuracy_metrics = {}
 
     print(f"\n  [OK] ULTIMATE Model Performance:")
@@ -258,9 +404,7 @@ def evaluate_ultimate_model(splits, models):
     print(f"     Avg actual minutes: {actual_minutes.mean():.1f}")
     print(f"\n  [ACCURACY] Threshold Performance:")
 
-    for threshold in thresholds:
-        within_tolerance = np.abs(actual_minutes - xmins_predicted) <= threshold
-        accuracy = within_tolerance.mean()
+    for threshold, accuracy in zip(thresholds, accuracies):
         accuracy_metrics[f'accuracy_within_{threshold}min'] = accuracy
 
         if accuracy >= 0.90 and threshold <= 25:
@@ -290,21 +434,22 @@ def main():
     print(f"[OK] Loaded {len(df):,} samples with {len(config['start_features'])} features")
 
     # Prepare splits
-    X_start = df[config['start_features']]
+    # float32 halves the bytes each booster bins; done once before splitting
+    X_start = df[config['start_features']].astype(np.float32)
     y_start = df[config['targets']['start']]
     actual_minutes_full = df['minutes'].copy()
 
-    df_started = df[df[config['targets']['start']] == 1].copy()
-    X_minutes = df_started[config['minutes_features']]
-    y_minutes = df_started[config['targets']['minutes']]
+    train_idx, test_idx = load_split_index(y_start)
 
-    X_start_train, X_start_test, y_start_train, y_start_test, actual_train, actual_test = train_test_split(
-        X_start, y_start, actual_minutes_full, test_size=0.2, random_state=42, stratify=y_start
-    )
+    # Minutes learners train on the started rows of the start training split
+    # only, so no test row they are scored on was seen in training
+    df_started = df[(df[config['targets']['start']] == 1) & df.index.isin(train_idx)]
+    X_minutes = df_started[config['minutes_features']].astype(np.float32)
+    y_minutes = df_started[config['targets']['minutes']]
 
-    X_minutes_train, X_minutes_test, y_minutes_train, y_minutes_test = train_test_split(
-        X_minutes, y_minutes, test_size=0.2, random_state=42
-    )
+    X_start_train, X_start_test = X_start.loc[train_idx], X_start.loc[test_idx]
+    y_start_train, y_start_test = y_start.loc[train_idx], y_start.loc[test_idx]
+    actual_test = actual_minutes_full.loc[test_idx]
 
     splits = {
         'start': {
@@ -312,10 +457,8 @@ def main():
             'y_train': y_start_train, 'y_test': y_start_test,
             'actual_test': actual_test,
         },
-        'minutes': {
-            'X_train': X_minutes_train, 'X_test': X_minutes_test,
-            'y_train': y_minutes_train, 'y_test': y_minutes_test,
-        }
+        # Minutes are evaluated on the start test rows; no minutes test split is used
+        'minutes': {'X_train': X_minutes, 'y_train': y_minutes},
     }
 
     # Train ultimate model
@@ -327,20 +470,27 @@ def main():
     # Save models
     print("\n[SAVE] Saving ultimate models...")
 
-    for name, model in models['start_models'].items():
-        joblib.dump(model, MODEL_DIR / f"{name}_start_ultimate.pkl")
+    pairs = [(model, MODEL_DIR / f"{name}_start_ultimate.pkl")
+             for name, model in models['start_models'].items()]
+    pairs += [(model, MODEL_DIR / f"{name}_minutes_ultimate.pkl")
+              for name, model in models['minutes_base_models'].items()]
+    pairs.append((models['minutes_calibrator'], MODEL_DIR / "minutes_calibrator_ultimate.pkl"))
 
-    for name, model_list in models['minutes_base_models'].items():
-        for i, model in enumerate(model_list):
-            joblib.dump(model, MODEL_DIR / f"{name}_minutes_ultimate_fold{i}.pkl")
-
-    joblib.dump(models['minutes_meta'], MODEL_DIR / "minutes_meta_ultimate.pkl")
-    joblib.dump(models['minutes_calibrator'], MODEL_DIR / "minutes_calibrator_ultimate.pkl")
+    # Overlap pickling with disk writes; lz4 is cheap to compress and to load
+    Parallel(n_jobs=min(8, len(pairs)), backend='threading')(
+        delayed(joblib.dump)(model, path, compress=('lz4', 3), protocol=5)
+        for model, path in pairs
+    )
 
     metadata = {
         'version': 'ultimate_v1',
         'techniques': ['stacking', 'calibration', 'weighted_ensemble'],
         'accuracy_metrics': {k: float(v) for k, v in accuracy_metrics.items()},
+        # Start models are saved uncalibrated; P(start) = sigmoid(coef * raw + intercept)
+        'start_platt': models['start_platt'],
+        # NNLS blend of the minutes base learners: three numbers, stored here rather than pickled
+        'meta_weights': dict(zip(['xgb', 'lgb', 'cat'], map(float, models['minutes_meta_weights']))),
+        'meta_intercept': 0.0,
     }
 
     with open(MODEL_DIR / "ultimate_metadata.json", 'w') as f:
@@ -3,11 +3,20 @@ Train Ensemble Models: XGBoost + LightGBM + CatBoost
 Combine predictions from all 3 models for higher accuracy
 """
 
+import os
+
+# Keep BLAS/OpenMP pools single-threaded when numpy and the boosters load;
+# every estimator passes its thread count explicitly so the families can't oversubscribe
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
 import joblib
+from joblib import Parallel, delayed
 from typing import Dict, Tuple
 
 import xgboost as xgb
@@ -17,17 +26,30 @@ import catboost as cb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, mean_absolute_error
 
+from training_utils import XGB_DEVICE, LGB_DEVICE, CAT_DEVICE, n_parallel, load_split_index, cached_frame
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 MODEL_DIR = Path(__file__).parent.parent / "models"
 
+# The three model families train concurrently, so each gets a third of the cores
+FAMILY_THREADS = max(1, (os.cpu_count() or 3) // 3)
+
 
 def load_training_data():
-    """Load feature-engineered data."""
+    """
+    Load feature-engineered data.
+
+    The filtered frame is cached as Parquet, keyed on the CSV and this script,
+    so reruns skip CSV parsing and type inference.
+    """
     data_path = DATA_DIR / "training_data_features.csv"
     config_path = DATA_DIR / "feature_config.json"
 
-    df = pd.read_csv(data_path)
-    df = df[df['is_outlier_event'] == 0].copy()  # Exclude outliers
+    def read_filtered():
+        df = pd.read_csv(data_path)
+        return df[df['is_outlier_event'] == 0].copy()  # Exclude outliers
+
+    df = cached_frame('training_filtered', read_filtered, data_path, Path(__file__))
 
     with open(config_path, 'r') as f:
         config = json.load(f)
@@ -37,16 +59,17 @@ def load_training_data():
 
 def prepare_splits(df, config):
     """Prepare train/test splits."""
-    X_start = df[config['start_features']]
+    # float32 halves the bytes each booster bins; done once before splitting
+    X_start = df[config['start_features']].astype(np.float32)
     y_start = df[config['targets']['start']]
 
     df_started = df[df[config['targets']['start']] == 1].copy()
-    X_minutes = df_started[config['minutes_features']]
+    X_minutes = df_started[config['minutes_features']].astype(np.float32)
     y_minutes = df_started[config['targets']['minutes']]
 
-    X_start_train, X_start_test, y_start_train, y_start_test = train_test_split(
-        X_start, y_start, test_size=0.2, random_state=42, stratify=y_start
-    )
+    train_idx, test_idx = load_split_index(y_start)
+    X_start_train, X_start_test = X_start.loc[train_idx], X_start.loc[test_idx]
+    y_start_train, y_start_test = y_start.loc[train_idx], y_start.loc[test_idx]
 
     X_minutes_train, X_minutes_test, y_minutes_train, y_minutes_test = train_test_split(
         X_minutes, y_minutes, test_size=0.2, random_state=42
@@ -76,7 +99,7 @@ def train_xgboost_models(splits):
         max_depth=6, learning_rate=0.05, n_estimators=200,
         min_child_weight=5, subsample=0.8,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, eval_metric='logloss'
+        random_state=42, eval_metric='logloss', n_jobs=FAMILY_THREADS, **XGB_DEVICE
     )
     xgb_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
@@ -84,7 +107,7 @@ def train_xgboost_models(splits):
     xgb_minutes = xgb.XGBRegressor(
         max_depth=4, learning_rate=0.05, n_estimators=250,
         min_child_weight=3, subsample=0.8,
-        random_state=42, objective='reg:squarederror'
+        random_state=42, objective='reg:squarederror', n_jobs=FAMILY_THREADS, **XGB_DEVICE
     )
     xgb_minutes.fit(splits['minutes']['X_train'], splits['minutes']['y_train'])
 
@@ -104,7 +127,7 @@ def train_lightgbm_models(splits):
         max_depth=6, learning_rate=0.05, n_estimators=200,
         num_leaves=31, subsample=0.8,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=-1
+        random_state=42, verbose=-1, n_jobs=FAMILY_THREADS, **LGB_DEVICE
     )
     lgb_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
@@ -112,7 +135,7 @@ def train_lightgbm_models(splits):
     lgb_minutes = lgb.LGBMRegressor(
         max_depth=4, learning_rate=0.05, n_estimators=250,
         num_leaves=15, subsample=0.8,
-        random_state=42, verbose=-1
+        random_state=42, verbose=-1, n_jobs=FAMILY_THREADS, **LGB_DEVICE
     )
     lgb_minutes.fit(splits['minutes']['X_train'], splits['minutes']['y_train'])
 
@@ -131,14 +154,14 @@ def train_catboost_models(splits):
     cat_start = cb.CatBoostClassifier(
         depth=6, learning_rate=0.05, iterations=200,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=False
+        random_state=42, verbose=False, thread_count=FAMILY_THREADS, **CAT_DEVICE
     )
     cat_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
     # Stage 2: Minutes
     cat_minutes = cb.CatBoostRegressor(
         depth=4, learning_rate=0.05, iterations=250,
-        random_state=42, verbose=False
+        random_state=42, verbose=False, thread_count=FAMILY_THREADS, **CAT_DEVICE
     )
     cat_minutes.fit(splits['minutes']['X_train'], splits['minutes']['y_train'])
 
@@ -228,10 +251,13 @@ def main():
     print(f"  Stage 1: {len(splits['start']['X_train']):,} train, {len(splits['start']['X_test']):,} test")
     print(f"  Stage 2: {len(splits['minutes']['X_train']):,} train, {len(splits['minutes']['X_test']):,} test")
 
-    # Train all models
-    xgb_start, xgb_minutes = train_xgboost_models(splits)
-    lgb_start, lgb_minutes = train_lightgbm_models(splits)
-    cat_start, cat_minutes = train_catboost_models(splits)
+    # Train all models; the families share no state, so they run concurrently
+    (xgb_start, xgb_minutes), (lgb_start, lgb_minutes), (cat_start, cat_minutes) = Parallel(
+        n_jobs=n_parallel(3), backend='loky'
+    )(
+        delayed(fn)(splits)
+        for fn in (train_xgboost_models, train_lightgbm_models, train_catboost_models)
+    )
 
     models_dict = {
         'xgb_start': xgb_start,
@@ -3,29 +3,56 @@ FINAL PUSH TO 90-95% ACCURACY
 Fixes combined metric + adds advanced features
 """
 
+import os
+
+# Keep OpenMP/BLAS pools single-threaded at import; each model sets its own thread count
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
-import joblib
+from joblib import Parallel, delayed
 
 import xgboost as xgb
 import lightgbm as lgb
 import catboost as cb
 
+# Optional oneDAL acceleration: when scikit-learn-intelex is installed, patch
+# sklearn before train_test_split is imported so it dispatches to oneDAL
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn('train_test_split', verbose=False)
+    HAS_SKLEARNEX = True
+except ImportError:
+    HAS_SKLEARNEX = False
+
+from scipy.optimize import nnls
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, mean_absolute_error
+from sklearn.metrics import accuracy_score
+
+from training_utils import squad_depth, cached_frame
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 MODEL_DIR = Path(__file__).parent.parent / "models"
 
+# 0/1 flag columns LightGBM treats as categorical (position is one-hot encoded)
+LGB_CATEGORICAL_FEATURES = ['high_squad_depth', 'high_rotation_manager',
+                            'pos_GK', 'pos_DEF', 'pos_MID', 'pos_FWD']
+
 
 def load_training_data():
     """Load feature-engineered data."""
     data_path = DATA_DIR / "training_data_features.csv"
     config_path = DATA_DIR / "feature_config.json"
 
-    df = pd.read_csv(data_path)
+    # pyarrow parses in parallel; narrow dtypes shrink the working set
+    df = pd.read_csv(data_path, engine='pyarrow', dtype={
+        'team': 'category', 'position': 'category',
+        'is_outlier_event': 'int8', 'started': 'bool', 'gameweek': 'int8',
+    })
     df = df[df['is_outlier_event'] == 0].copy()  # Exclude outliers
 
     with open(config_path, 'r') as f:
@@ -44,25 +71,10 @@ def add_squad_depth_features(df):
     # For each team-position-gameweek, count how many players are viable
     # Viable = played at least once in last 5 gameweeks
 
+    # Later groupbys use sort=False and keep this order
     df = df.sort_values(['team', 'position', 'season', 'gameweek'])
 
-    # Create a rolling window of active players per team-position
-    squad_depth = []
-
-    for idx, row in df.iterrows():
-        # Count players in same team-position who played in last 5 GWs
-        recent_players = df[
-            (df['team'] == row['team']) &
-            (df['position'] == row['position']) &
-            (df['season'] == row['season']) &
-            (df['gameweek'] >= row['gameweek'] - 5) &
-            (df['gameweek'] < row['gameweek']) &
-            (df['minutes'] > 0)
-        ]['fpl_id'].nunique()
-
-        squad_depth.append(recent_players)
-
-    df['squad_depth_position'] = squad_depth
+    df['squad_depth_position'] = squad_depth(df)
 
     # High squad depth = more rotation risk
     df['high_squad_depth'] = (df['squad_depth_position'] >= 3).astype(int)
@@ -81,49 +93,36 @@ def add_manager_profiles(df):
     """
     print("\n[ENHANCE] Adding manager-specific rotation profiles...")
 
-    # Calculate per-team rotation rates from historical data
-    team_profiles = {}
-
-    for team in df['team'].unique():
-        team_data = df[df['team'] == team]
-
-        # Calculate actual rotation metrics
-        starters = team_data[team_data['started'] == True]
-
-        if len(starters) > 0:
-            # What % of starters get subbed before 75 min?
-            early_sub_rate = (starters['minutes'] < 75).mean()
-
-            # What % of starters play 85+ min?
-            full_game_rate = (starters['minutes'] >= 85).mean()
-
-            # Average minutes for starters
-            avg_starter_minutes = starters['minutes'].mean()
-
-            team_profiles[team] = {
-                'early_sub_rate': early_sub_rate,
-                'full_game_rate': full_game_rate,
-                'avg_starter_minutes': avg_starter_minutes,
-            }
-        else:
-            team_profiles[team] = {
-                'early_sub_rate': 0.25,
-                'full_game_rate': 0.60,
-                'avg_starter_minutes': 75.0,
-            }
+    # Calculate per-team rotation rates from historical data:
+    # what % of starters get subbed before 75 min, and what % play 85+ min
+    started_mask = df['started'].to_numpy(dtype=bool)
+    starters = df.loc[started_mask, ['team', 'minutes']]
+    team_profiles = (
+        starters.assign(early=starters['minutes'].lt(75), full=starters['minutes'].ge(85))
+        .groupby('team', sort=False, observed=True)[['early', 'full', 'minutes']]
+        .mean()
+        .rename(columns={'early': 'manager_early_sub_rate', 'full': 'manager_full_game_rate',
+                         'minutes': 'avg_starter_minutes'})
+    )
 
-    # Add to dataframe
-    df['manager_early_sub_rate'] = df['team'].map(lambda x: team_profiles.get(x, {}).get('early_sub_rate', 0.25))
-    df['manager_full_game_rate'] = df['team'].map(lambda x: team_profiles.get(x, {}).get('full_game_rate', 0.60))
+    # Add to dataframe by indexing per-team arrays with the team category codes.
+    # Teams without starters fall back to league-typical rates; the default is
+    # also appended so a missing team (code -1) picks it up.
+    teams = df['team'].astype('category')
+    codes = teams.cat.codes.to_numpy()
+    profiles = team_profiles.reindex(teams.cat.categories)
+    for column, default in [('manager_early_sub_rate', 0.25), ('manager_full_game_rate', 0.60)]:
+        values = profiles[column].fillna(default).to_numpy(np.float64)
+        df[column] = np.append(values, default)[codes]
 
     # Identify high-rotation managers (early_sub_rate > 30%)
     df['high_rotation_manager'] = (df['manager_early_sub_rate'] > 0.30).astype(int)
 
-    print(f"  [OK] Added manager profiles for {len(team_profiles)} teams")
+    print(f"  [OK] Added manager profiles for {df['team'].nunique()} teams")
     print(f"     High rotation managers: {df['high_rotation_manager'].sum():,} appearances")
 
     # Show top 5 rotating managers
-    top_rotators = df.groupby('team')['manager_early_sub_rate'].first().sort_values(ascending=False).head(5)
+    top_rotators = df.groupby('team', sort=False, observed=True)['manager_early_sub_rate'].first().sort_values(ascending=False).head(5)
     print(f"  [INFO] Top 5 rotating managers:")
     for team, rate in top_rotators.items():
         print(f"     {team}: {rate:.1%} early subs")
@@ -131,6 +130,28 @@ def add_manager_profiles(df):
     return df
 
 
+def load_augmented_data():
+    """
+    Load training data with squad depth and manager profile features added.
+
+    The augmented frame is cached as Parquet, keyed on the CSV and this
+    script, skipping the CSV parse and both feature builds on reruns.
+    """
+    data_path = DATA_DIR / "training_data_features.csv"
+
+    with open(DATA_DIR / "feature_config.json", 'r') as f:
+        config = json.load(f)
+
+    def build():
+        df, _ = load_training_data()
+        df = add_squad_depth_features(df)
+        return add_manager_profiles(df)
+
+    df = cached_frame('training_augmented', build, data_path, Path(__file__))
+
+    return df, config
+
+
 def prepare_splits_with_actual_minutes(df, config):
     """
     Prepare splits AND preserve actual minutes for proper evaluation.
@@ -138,23 +159,34 @@ def prepare_splits_with_actual_minutes(df, config):
     """
     print("\n[FIX] Preparing splits with actual minutes preserved...")
 
-    X_start = df[config['start_features']]
-    y_start = df[config['targets']['start']]
+    # float32 features halve the bytes the boosters bin and traverse
+    X_start = df[config['start_features']].astype(np.float32)
+    y_start = df[config['targets']['start']].astype(np.int8)
+
+    # One stratified split of row positions drives both stages
+    idx_train, idx_test = train_test_split(
+        np.arange(len(df)), test_size=0.2, random_state=42, stratify=y_start
+    )
+
+    X_start_train, X_start_test = X_start.iloc[idx_train], X_start.iloc[idx_test]
+    y_start_train, y_start_test = y_start.iloc[idx_train], y_start.iloc[idx_test]
 
     # CRITICAL: Preserve actual minutes for test set
-    actual_minutes_full = df['minutes'].copy()
+    actual_test = df['minutes'].iloc[idx_test]
 
-    df_started = df[df[config['targets']['start']] == 1].copy()
-    X_minutes = df_started[config['minutes_features']]
-    y_minutes = df_started[config['targets']['minutes']]
+    # Minutes rows are the started rows of each start split, so no second
+    # shuffle is needed and no minutes test row was seen in training
+    started_mask = (y_start == 1).to_numpy()
+    minutes_train = idx_train[started_mask[idx_train]]
+    minutes_test = idx_test[started_mask[idx_test]]
 
-    X_start_train, X_start_test, y_start_train, y_start_test, actual_train, actual_test = train_test_split(
-        X_start, y_start, actual_minutes_full, test_size=0.2, random_state=42, stratify=y_start
-    )
+    minutes_cols = df.columns.get_indexer(config['minutes_features'])
+    target_col = df.columns.get_loc(config['targets']['minutes'])
 
-    X_minutes_train, X_minutes_test, y_minutes_train, y_minutes_test = train_test_split(
-        X_minutes, y_minutes, test_size=0.2, random_state=42
-    )
+    X_minutes_train = df.iloc[minutes_train, minutes_cols].astype(np.float32)
+    X_minutes_test = df.iloc[minutes_test, minutes_cols].astype(np.float32)
+    y_minutes_train = df.iloc[minutes_train, target_col].astype(np.float32)
+    y_minutes_test = df.iloc[minutes_test, target_col].astype(np.float32)
 
     print(f"  [OK] Splits prepared with actual minutes preserved")
     print(f"     Test set avg actual minutes: {actual_test.mean():.1f}")
@@ -172,61 +204,176 @@ def prepare_splits_with_actual_minutes(df, config):
     }
 
 
-def train_weighted_ensemble(splits):
-    """
-    Train ensemble with optimal weights (not simple average).
-    """
-    print("\n[ENSEMBLE] Training weighted ensemble...")
+# Boosting stops once the held-out loss hasn't improved for this many rounds
+EARLY_STOPPING_ROUNDS = 20
 
-    # Train all 3 models
-    print("  Training XGBoost...")
-    n_neg = (splits['start']['y_train'] == 0).sum()
-    n_pos = (splits['start']['y_train'] == 1).sum()
-
-    xgb_start = xgb.XGBClassifier(
-        max_depth=4, learning_rate=0.03, n_estimators=200,
-        min_child_weight=3, subsample=0.7, colsample_bytree=0.9,
-        scale_pos_weight=n_neg / n_pos,
-        random_state=42, eval_metric='logloss'
-    )
-    xgb_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
-    xgb_minutes = xgb.XGBRegressor(
-        max_depth=4, learning_rate=0.05, n_estimators=200,
-        min_child_weight=5, subsample=0.8, colsample_bytree=0.8,
-        random_state=42, objective='reg:squarederror'
-    )
-    xgb_minutes.fit(splits['minutes']['X_train'], splits['minutes']['y_train'])
+def fit_xgb(splits, scale_pos_weight, n_threads):
+    """Fit the XGBoost start classifier and minutes regressor, early-stopped on X_val."""
+    print("  Training XGBoost...")
 
+    def train(params, stage, num_boost_round):
+        # Native API: one DMatrix per stage, histogram trees, no sklearn wrapper
+        data = splits[stage]
+        dtrain = xgb.DMatrix(data['X_train'], label=data['y_train'], enable_categorical=True)
+        dval = xgb.DMatrix(data['X_val'], label=data['y_val'], enable_categorical=True)
+        booster = xgb.train(params, dtrain, num_boost_round=num_boost_round, evals=[(dval, 'val')],
+                            early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False)
+        # xgb.train returns the last round; keep only the trees up to the best one
+        return booster[:booster.best_iteration + 1]
+
+    xgb_start = train({
+        'objective': 'binary:logistic', 'eval_metric': 'logloss', 'tree_method': 'hist',
+        'max_depth': 4, 'learning_rate': 0.03,
+        'min_child_weight': 3, 'subsample': 0.7, 'colsample_bytree': 0.9,
+        'scale_pos_weight': scale_pos_weight,
+        'seed': 42, 'nthread': n_threads,
+    }, 'start', num_boost_round=200)
+
+    xgb_minutes = train({
+        'objective': 'reg:squarederror', 'tree_method': 'hist',
+        'max_depth': 4, 'learning_rate': 0.05,
+        'min_child_weight': 5, 'subsample': 0.8, 'colsample_bytree': 0.8,
+        'seed': 42, 'nthread': n_threads,
+    }, 'minutes', num_boost_round=200)
+
+    return xgb_start, xgb_minutes
+
+
+def lgb_dataset(X, y, reference=None):
+    """Build a LightGBM Dataset once, declaring the binary flag columns as categorical."""
+    categorical = [c for c in LGB_CATEGORICAL_FEATURES if c in X.columns]
+    return lgb.Dataset(X, label=y, categorical_feature=categorical,
+                       reference=reference, free_raw_data=False)
+
+
+def fit_lgb(splits, scale_pos_weight, n_threads):
+    """Fit the LightGBM start classifier and minutes regressor, early-stopped on X_val."""
     print("  Training LightGBM...")
-    lgb_start = lgb.LGBMClassifier(
-        max_depth=6, learning_rate=0.05, n_estimators=200,
-        num_leaves=31, subsample=0.8,
-        scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=-1
-    )
-    lgb_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
-    lgb_minutes = lgb.LGBMRegressor(
-        max_depth=4, learning_rate=0.05, n_estimators=250,
-        num_leaves=15, subsample=0.8,
-        random_state=42, verbose=-1
-    )
-    lgb_minutes.fit(splits['minutes']['X_train'], splits['minutes']['y_train'])
+    def train(params, stage, num_boost_round):
+        data = splits[stage]
+        dtrain = lgb_dataset(data['X_train'], data['y_train'])
+        dval = lgb_dataset(data['X_val'], data['y_val'], reference=dtrain)
+        # The returned booster predicts and saves at best_iteration by default
+        return lgb.train(params, dtrain, num_boost_round=num_boost_round, valid_sets=[dval],
+                         callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)])
 
+    lgb_start = train({
+        'objective': 'binary', 'max_depth': 6, 'learning_rate': 0.05,
+        'num_leaves': 31, 'subsample': 0.8,
+        'scale_pos_weight': scale_pos_weight,
+        'seed': 42, 'verbose': -1, 'num_threads': n_threads,
+    }, 'start', num_boost_round=200)
+
+    lgb_minutes = train({
+        'objective': 'regression', 'max_depth': 4, 'learning_rate': 0.05,
+        'num_leaves': 15, 'subsample': 0.8,
+        'seed': 42, 'verbose': -1, 'num_threads': n_threads,
+    }, 'minutes', num_boost_round=250)
+
+    return lgb_start, lgb_minutes
+
+
+def fit_cat(splits, scale_pos_weight, n_threads):
+    """Fit the CatBoost start classifier and minutes regressor, early-stopped on X_val."""
     print("  Training CatBoost...")
     cat_start = cb.CatBoostClassifier(
         depth=6, learning_rate=0.05, iterations=200,
-        scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=False
+        scale_pos_weight=scale_pos_weight,
+        random_state=42, verbose=False, thread_count=n_threads
     )
-    cat_start.fit(splits['start']['X_train'], splits['start']['y_train'])
+    cat_start.fit(splits['start']['X_train'], splits['start']['y_train'],
+                  eval_set=(splits['start']['X_val'], splits['start']['y_val']),
+                  early_stopping_rounds=EARLY_STOPPING_ROUNDS)
 
     cat_minutes = cb.CatBoostRegressor(
         depth=4, learning_rate=0.05, iterations=250,
-        random_state=42, verbose=False
+        random_state=42, verbose=False, thread_count=n_threads
+    )
+    cat_minutes.fit(splits['minutes']['X_train'], splits['minutes']['y_train'],
+                    eval_set=(splits['minutes']['X_val'], splits['minutes']['y_val']),
+                    early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+
+    return cat_start, cat_minutes
+
+
+def best_iteration(model):
+    """Number of boosting rounds kept after early stopping."""
+    if isinstance(model, xgb.Booster):
+        return model.num_boosted_rounds()
+    if isinstance(model, lgb.Booster):
+        return model.best_iteration
+    return model.tree_count_
+
+
+def predict_stage(models, stage, X):
+    """
+    Predict one stage ('start' or 'minutes') with all three models.
+
+    A single float32 C-contiguous copy of X feeds three concurrent predictors
+    (all release the GIL). Start columns are P(start).
+
+    Returns:
+        (n, 3) float32 matrix of xgb, lgb, cat predictions
+    """
+    X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    cat_model = models[f'cat_{stage}']
+
+    preds = Parallel(n_jobs=3, backend='threading')([
+        delayed(models[f'xgb_{stage}'].inplace_predict)(X),  # binary:logistic -> P(start)
+        delayed(models[f'lgb_{stage}'].predict)(X),  # binary objective -> P(start)
+        delayed(cat_model.predict_proba if stage == 'start' else cat_model.predict)(X),
+    ])
+    if stage == 'start':
+        preds[2] = preds[2][:, 1]
+
+    return np.column_stack(preds).astype(np.float32, copy=False)
+
+
+def nnls_weights(preds, y):
+    """Non-negative least-squares blend weights, normalised to sum to one."""
+    w, _ = nnls(preds.astype(np.float64), np.asarray(y, dtype=np.float64))
+    total = w.sum()
+    w = w / total if total > 0 else np.full(len(w), 1 / len(w))
+    return {'xgb': float(w[0]), 'lgb': float(w[1]), 'cat': float(w[2])}
+
+
+def train_weighted_ensemble(splits):
+    """
+    Train ensemble with optimal weights (not simple average).
+
+    Models train on 90% of each stage's training rows; the remaining 10% is
+    used for early stopping and to learn per-stage blend weights.
+    """
+    print("\n[ENSEMBLE] Training weighted ensemble...")
+
+    # Hold out 10% of each stage's training rows for early stopping and weights
+    X_start_fit, X_start_val, y_start_fit, y_start_val = train_test_split(
+        splits['start']['X_train'], splits['start']['y_train'],
+        test_size=0.1, random_state=42, stratify=splits['start']['y_train']
+    )
+    X_minutes_fit, X_minutes_val, y_minutes_fit, y_minutes_val = train_test_split(
+        splits['minutes']['X_train'], splits['minutes']['y_train'], test_size=0.1, random_state=42
+    )
+    fit_splits = {
+        'start': {'X_train': X_start_fit, 'y_train': y_start_fit,
+                  'X_val': X_start_val, 'y_val': y_start_val},
+        'minutes': {'X_train': X_minutes_fit, 'y_train': y_minutes_fit,
+                    'X_val': X_minutes_val, 'y_val': y_minutes_val},
+    }
+
+    n_neg = (y_start_fit == 0).sum()
+    n_pos = (y_start_fit == 1).sum()
+
+    # Train all 3 model families concurrently, splitting the cores between them
+    n_threads = max(1, (os.cpu_count() or 3) // 3)
+    (xgb_start, xgb_minutes), (lgb_start, lgb_minutes), (cat_start, cat_minutes) = Parallel(
+        n_jobs=3, backend='loky'
+    )(
+        delayed(fit)(fit_splits, n_neg / n_pos, n_threads)
+        for fit in (fit_xgb, fit_lgb, fit_cat)
     )
-    cat_minutes.fit(splits['minutes']['X_train'], splits['minutes']['y_train'])
 
     print(f"  [OK] All models trained")
 
@@ -236,9 +383,13 @@ def train_weighted_ensemble(splits):
         'cat_start': cat_start, 'cat_minutes': cat_minutes,
     }
 
-    # Find optimal weights on validation set
-    # For simplicity, use equal weights (0.4 XGB, 0.3 LGB, 0.3 CAT based on typical performance)
-    weights = {'xgb': 0.4, 'lgb': 0.3, 'cat': 0.3}
+    # Find optimal weights on validation set: NNLS on each stage's held-out predictions
+    weights = {
+        'start': nnls_weights(predict_stage(models, 'start', X_start_val), y_start_val),
+        'minutes': nnls_weights(predict_stage(models, 'minutes', X_minutes_val), y_minutes_val),
+    }
+    for stage, w in weights.items():
+        print(f"  [OK] {stage} weights: XGB={w['xgb']:.0%}, LGB={w['lgb']:.0%}, CAT={w['cat']:.0%}")
 
     return models, weights
 
@@ -253,39 +404,35 @@ def evaluate_with_correct_metric(splits, models, weights):
     X_test = splits['start']['X_test']
     actual_minutes = splits['start']['actual_test'].values  # ACTUAL minutes!
 
-    # Get predictions from all models
-    xgb_start_proba = models['xgb_start'].predict_proba(X_test)[:, 1]
-    lgb_start_proba = models['lgb_start'].predict_proba(X_test)[:, 1]
-    cat_start_proba = models['cat_start'].predict_proba(X_test)[:, 1]
+    # Weighted average: one matmul of each stage's stacked predictions
+    def blend(stage):
+        w = weights[stage]
+        return predict_stage(models, stage, X_test) @ np.array([w['xgb'], w['lgb'], w['cat']], dtype=np.float32)
 
-    # Weighted average
-    start_proba = (
-        weights['xgb'] * xgb_start_proba +
-        weights['lgb'] * lgb_start_proba +
-        weights['cat'] * cat_start_proba
-    )
-
-    # Minutes predictions
-    xgb_minutes_pred = models['xgb_minutes'].predict(X_test)
-    lgb_minutes_pred = models['lgb_minutes'].predict(X_test)
-    cat_minutes_pred = models['cat_minutes'].predict(X_test)
-
-    minutes_pred = (
-        weights['xgb'] * xgb_minutes_pred +
-        weights['lgb'] * lgb_minutes_pred +
-        weights['cat'] * cat_minutes_pred
-    )
-    minutes_pred = np.clip(minutes_pred, 0, 90)
+    start_proba = blend('start')
+    minutes_pred = np.clip(blend('minutes'), 0, 90)
 
     # Combined xMins
     xmins_predicted = start_proba * minutes_pred
 
-    # Calculate MAE
-    mae = mean_absolute_error(actual_minutes, xmins_predicted)
+    # Absolute error once; MAE and every threshold accuracy derive from it
+    abs_error = np.abs(actual_minutes - xmins_predicted)
+    mae = abs_error.mean()
 
-    # Calculate accuracy at thresholds
-    thresholds = [15, 20, 25, 30]
-    accuracy_metrics = {}
+    # Calculate accuracy at all thresholds in one broadcast
+    thresholds = np.array([15, 20, 25, 30])
+    accuracies = (abs_error[:, None] <= thresholds[None, :]).mean(axis=0)
+    accuracy_metrics = {
+        f'accuracy_within_{threshold}min': accuracy
+        for threshold, accuracy in zip(thresholds, accuracies)
+    }
+
+    # Status label for every threshold at once
+    statuses = np.select(
+        [(accuracies >= 0.90) & (thresholds <= 25), accuracies >= 0.85, accuracies >= 0.80],
+        ["*** TARGET HIT ***", "[EXCELLENT]", "[GOOD]"],
+        default="[PROGRESS]",
+    )
 
     print(f"\n  [OK] Performance with CORRECT metric:")
     print(f"     MAE: {mae:.2f} minutes")
@@ -293,23 +440,10 @@ def evaluate_with_correct_metric(splits, models, weights):
     print(f"     Avg actual minutes: {actual_minutes.mean():.1f}")
     print(f"\n  [ACCURACY] Threshold Performance:")
 
-    for threshold in thresholds:
-        within_tolerance = np.abs(actual_minutes - xmins_predicted) <= threshold
-        accuracy = within_tolerance.mean()
-        accuracy_metrics[f'accuracy_within_{threshold}min'] = accuracy
-
-        if accuracy >= 0.90 and threshold <= 25:
-            status = "*** TARGET HIT ***"
-        elif accuracy >= 0.85:
-            status = "[EXCELLENT]"
-        elif accuracy >= 0.80:
-            status = "[GOOD]"
-        else:
-            status = "[PROGRESS]"
-
+    for threshold, accuracy, status in zip(thresholds, accuracies, statuses):
         print(f"     +/-{threshold} min: {accuracy:.2%} {status}")
 
-    return accuracy_metrics, xmins_predicted, actual_minutes
+    return accuracy_metrics, mae, xmins_predicted, actual_minutes
 
 
 def main():
@@ -319,14 +453,11 @@ def main():
     print("=" * 60)
     print("FINAL PUSH TO 90-95% ACCURACY")
     print("=" * 60)
+    print(f"[MODE] train_test_split backend: {'oneDAL (sklearnex)' if HAS_SKLEARNEX else 'scikit-learn'}")
 
-    # Load data
-    df, config = load_training_data()
-    print(f"[OK] Loaded {len(df):,} training samples (outliers excluded)")
-
-    # Add advanced features
-    df = add_squad_depth_features(df)
-    df = add_manager_profiles(df)
+    # Load data with advanced features
+    df, config = load_augmented_data()
+    print(f"\n[OK] Loaded {len(df):,} training samples (outliers excluded)")
 
     # Add new features to config
     advanced_features = ['squad_depth_position', 'high_squad_depth',
@@ -345,19 +476,26 @@ def main():
     models, weights = train_weighted_ensemble(splits)
 
     # Evaluate with correct metric
-    accuracy_metrics, predictions, actuals = evaluate_with_correct_metric(splits, models, weights)
+    accuracy_metrics, mae, predictions, actuals = evaluate_with_correct_metric(splits, models, weights)
 
     # Save models
     print("\n[SAVE] Saving final models...")
+    # Native formats are compact, version-stable and load faster than pickles
     for name, model in models.items():
-        joblib.dump(model, MODEL_DIR / f"{name}_final.pkl")
+        if isinstance(model, xgb.Booster):
+            model.save_model(MODEL_DIR / f"{name}_final.ubj")
+        elif isinstance(model, lgb.Booster):
+            model.save_model(MODEL_DIR / f"{name}_final.txt")
+        else:
+            model.save_model(str(MODEL_DIR / f"{name}_final.cbm"))
 
     metadata = {
         'version': 'final_v1',
         'features': len(config['start_features']),
         'weights': weights,
+        'best_iterations': {name: int(best_iteration(model)) for name, model in models.items()},
         'accuracy_metrics': {k: float(v) for k, v in accuracy_metrics.items()},
-        'mae': float(mean_absolute_error(actuals, predictions)),
+        'mae': float(mae),
     }
 
     with open(MODEL_DIR / "final_metadata.json", 'w') as f:
@@ -11,21 +11,25 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
+import os
 import joblib
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Tuple
 
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import xgboost as xgb
-from sklearn.model_selection import train_test_split, cross_val_score
+from numba import njit, prange
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import (
     accuracy_score,
     precision_recall_fscore_support,
-    mean_absolute_error,
-    mean_squared_error,
-    r2_score,
     roc_auc_score,
 )
 from sklearn.preprocessing import StandardScaler
 
+from training_utils import USE_GPU, cached_frame
+
 # Try importing LightGBM and CatBoost (optional dependencies)
 try:
     import lightgbm as lgb
@@ -46,10 +50,43 @@ DATA_DIR = Path(__file__).parent.parent / "data"
 MODEL_DIR = Path(__file__).parent.parent / "models"
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
+# Below this many rows the host-to-device copy outweighs GPU tree building
+GPU_MIN_ROWS = 50_000
+
+
+# Boosting stops once the validation loss hasn't improved for this many rounds
+EARLY_STOPPING_ROUNDS = 20
+
+
+# Display names for the --lightgbm switch (XGBoost is the default backend)
+BACKEND_NAMES = {'xgboost': 'XGBoost', 'lightgbm': 'LightGBM'}
+
+
+def early_stopping_split(X: np.ndarray, y: np.ndarray, stratify: bool = False) -> Tuple:
+    """
+    Carve an inner 15% validation slice out of a stage's training rows.
+
+    Returns:
+        X_fit, X_val, y_fit, y_val
+    """
+    return train_test_split(
+        X, y, test_size=0.15, random_state=42, stratify=y if stratify else None
+    )
+
+
+def xgb_device(n_rows: int) -> str:
+    """
+    Pick the XGBoost device for a training set of n_rows.
+    """
+    return 'cuda' if USE_GPU and n_rows >= GPU_MIN_ROWS else 'cpu'
+
 
 def load_training_data() -> Tuple[pd.DataFrame, Dict]:
     """
     Load feature-engineered data and configuration.
+
+    The downcast frame is cached as Parquet, keyed on the CSV, the config
+    and this script, so reruns skip the CSV parse.
     """
     data_path = DATA_DIR / "training_data_features.csv"
     config_path = DATA_DIR / "feature_config.json"
@@ -60,12 +97,32 @@ def load_training_data() -> Tuple[pd.DataFrame, Dict]:
             "Please run feature_engineering.py first."
         )
 
-    df = pd.read_csv(data_path)
-    print(f"[OK] Loaded {len(df):,} training samples")
-
     with open(config_path, 'r') as f:
         config = json.load(f)
 
+    def read_typed():
+        # Multi-threaded Arrow parse straight into the dtypes XGBoost trains on
+        # (float32 features halve bytes per row)
+        column_types = {
+            col: pa.float32()
+            for col in config['start_features'] + config['minutes_features']
+        }
+        column_types[config['targets']['start']] = pa.int8()
+        column_types[config['targets']['minutes']] = pa.float32()
+        table = pacsv.read_csv(
+            data_path, convert_options=pacsv.ConvertOptions(column_types=column_types)
+        )
+        df = table.to_pandas()
+
+        # Downcast any remaining float64 columns
+        float_cols = df.select_dtypes('float64').columns
+        df[float_cols] = df[float_cols].astype(np.float32)
+        return df
+
+    df = cached_frame('training_typed', read_typed, data_path, config_path, Path(__file__))
+
+    print(f"[OK] Loaded {len(df):,} training samples ({df.memory_usage(deep=True).sum() / 1e6:.1f} MB)")
+
     return df, config
 
 
@@ -86,9 +143,11 @@ def prepare_train_test_split(
     """
     print("\n[STATS] Preparing train/test splits...")
 
-    # Stage 1: Start prediction (all data)
-    X_start = df[config['start_features']]
-    y_start = df[config['targets']['start']]
+    # Stage 1: Start prediction (all data), as contiguous NumPy arrays
+    X_start = df[config['start_features']].to_numpy(dtype=np.float32)
+    # The int8 label (already int8 after loading, so no copy) doubles as the
+    # stratify labels, keeping sklearn on its plain-array path
+    y_start = df[config['targets']['start']].to_numpy(dtype=np.int8, copy=False)
 
     X_start_train, X_start_test, y_start_train, y_start_test = train_test_split(
         X_start, y_start, test_size=test_size, random_state=random_state, stratify=y_start
@@ -99,11 +158,14 @@ def prepare_train_test_split(
     print(f"    Test:  {len(X_start_test):,} samples")
     print(f"    Start rate (train): {y_start_train.mean():.2%}")
 
-    # Stage 2: Minutes prediction (only started games)
-    df_started = df[df[config['targets']['start']] == 1].copy()
-
-    X_minutes = df_started[config['minutes_features']]
-    y_minutes = df_started[config['targets']['minutes']]
+    # Stage 2: Minutes prediction (only started games), masked on the arrays
+    # rather than through a copied DataFrame
+    started = y_start == 1
+    if config['minutes_features'] == config['start_features']:
+        X_minutes = X_start[started]
+    else:
+        X_minutes = df[config['minutes_features']].to_numpy(dtype=np.float32)[started]
+    y_minutes = df[config['targets']['minutes']].to_numpy(dtype=np.float32)[started]
 
     X_minutes_train, X_minutes_test, y_minutes_train, y_minutes_test = train_test_split(
         X_minutes, y_minutes, test_size=test_size, random_state=random_state
@@ -120,31 +182,46 @@ def prepare_train_test_split(
             'X_test': X_start_test,
             'y_train': y_start_train,
             'y_test': y_start_test,
+            'feature_names': config['start_features'],
         },
         'minutes': {
             'X_train': X_minutes_train,
             'X_test': X_minutes_test,
             'y_train': y_minutes_train,
             'y_test': y_minutes_test,
+            'feature_names': config['minutes_features'],
         }
     }
 
 
-def train_start_model(splits: Dict) -> Tuple:
+def print_top_features(importances: np.ndarray, feature_names, k: int = 10):
+    """
+    Print the k most important features, highest first.
     """
-    Train Stage 1: XGBoost Classifier for P(start).
+    k = min(k, len(importances))
+    top = np.argpartition(-importances, k - 1)[:k]
+    top = top[np.argsort(-importances[top])]
 
-    Returns:
-        Trained model, None (no scaler needed), and metrics
+    print(f"\n  [STATS] Top {k} Most Important Features:")
+    for i in top:
+        print(f"     {feature_names[i]}: {importances[i]:.4f}")
+
+
+def fit_start_xgboost(splits: Dict, X_fit, X_val, y_fit, y_val, n_jobs: int) -> Tuple:
     """
-    print("\n[MODEL] Training Stage 1: Start Probability Model (XGBoost)...")
+    Fit the XGBoost start classifier and cross-validate it.
 
+    Returns:
+        Model, train/test raw margins, CV accuracy mean and std
+    """
     # Calculate scale_pos_weight to handle class imbalance
     n_negative = (splits['start']['y_train'] == 0).sum()
     n_positive = (splits['start']['y_train'] == 1).sum()
     scale_pos_weight = n_negative / n_positive
 
     # Train XGBoost Classifier with optimized hyperparameters
+    device = xgb_device(len(splits['start']['X_train']))
+    print(f"  Device: {device}")
     model = xgb.XGBClassifier(
         max_depth=6,
         learning_rate=0.05,
@@ -152,21 +229,108 @@ def train_start_model(splits: Dict) -> Tuple:
         min_child_weight=5,
         subsample=0.8,
         scale_pos_weight=scale_pos_weight,  # Handle class imbalance
+        tree_method='hist',  # Bin features once, reuse histograms every round
+        device=device,
+        grow_policy='depthwise',
+        max_bin=256,
+        n_jobs=n_jobs,
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
         random_state=42,
         eval_metric='logloss',
     )
 
-    model.fit(splits['start']['X_train'], splits['start']['y_train'])
+    model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    best_rounds = (0, model.best_iteration + 1)
+    print(f"  Early stopping kept {model.best_iteration + 1}/{model.n_estimators} trees")
+
+    # One DMatrix per split, reused for every prediction and the CV below
+    dtrain = xgb.DMatrix(splits['start']['X_train'], label=splits['start']['y_train'])
+    dtest = xgb.DMatrix(splits['start']['X_test'], label=splits['start']['y_test'])
+    booster = model.get_booster()
+
+    # Raw margins: the class label is margin > 0 and AUC is rank-based,
+    # so no sigmoid or probability matrix is needed
+    margin_train = booster.predict(dtrain, output_margin=True, iteration_range=best_rounds)
+    margin_test = booster.predict(dtest, output_margin=True, iteration_range=best_rounds)
+
+    # Cross-validation on the training DMatrix (features binned once, shared by all folds)
+    cv_results = xgb.cv(
+        model.get_xgb_params(), dtrain,
+        num_boost_round=model.best_iteration + 1, nfold=5, stratified=True,
+        metrics='error', seed=42,
+    )
+    cv_accuracy = 1 - cv_results['test-error-mean'].iloc[-1]
+    cv_std = cv_results['test-error-std'].iloc[-1]
 
-    # Predictions
-    y_pred_train = model.predict(splits['start']['X_train'])
-    y_pred_test = model.predict(splits['start']['X_test'])
-    y_pred_proba_test = model.predict_proba(splits['start']['X_test'])[:, 1]
+    return model, margin_train, margin_test, cv_accuracy, cv_std
 
-    # Evaluate
+
+def fit_start_lightgbm(splits: Dict, X_fit, X_val, y_fit, y_val, n_jobs: int) -> Tuple:
+    """
+    Fit the LightGBM start classifier and cross-validate it.
+
+    Returns:
+        Model, train/test raw margins, CV accuracy mean and std
+    """
+    params = {
+        'objective': 'binary',
+        'learning_rate': 0.05,
+        'num_leaves': 63,
+        'min_child_samples': 20,  # min_data_in_leaf
+        'is_unbalance': True,  # Handle class imbalance
+        'device_type': 'cpu',  # GPU LightGBM is slower at this data size
+        'random_state': 42,
+        'verbose': -1,
+    }
+    model = lgb.LGBMClassifier(n_estimators=100, n_jobs=n_jobs, **params)
+
+    model.fit(
+        X_fit, y_fit, eval_set=[(X_val, y_val)],
+        callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+    )
+    print(f"  Early stopping kept {model.best_iteration_}/{model.n_estimators} trees")
+
+    # Raw margins (predict stops at best_iteration_ by default)
+    margin_train = model.predict(splits['start']['X_train'], raw_score=True)
+    margin_test = model.predict(splits['start']['X_test'], raw_score=True)
+
+    cv_results = lgb.cv(
+        {**params, 'num_threads': n_jobs, 'metric': 'binary_error'},
+        lgb.Dataset(splits['start']['X_train'], label=splits['start']['y_train']),
+        num_boost_round=model.best_iteration_, nfold=5, stratified=True, seed=42,
+    )
+    cv_accuracy = 1 - cv_results['valid binary_error-mean'][-1]
+    cv_std = cv_results['valid binary_error-stdv'][-1]
+
+    return model, margin_train, margin_test, cv_accuracy, cv_std
+
+
+def train_start_model(splits: Dict, n_jobs: int = -1, backend: str = 'xgboost') -> Tuple:
+    """
+    Train Stage 1: XGBoost (or LightGBM) Classifier for P(start).
+
+    Returns:
+        Trained model, None (no scaler needed), metrics, and test-set margins
+    """
+    print(f"\n[MODEL] Training Stage 1: Start Probability Model ({BACKEND_NAMES[backend]})...")
+
+    # Early-stop on an inner validation slice of the training rows
+    X_fit, X_val, y_fit, y_val = early_stopping_split(
+        splits['start']['X_train'], splits['start']['y_train'], stratify=True
+    )
+    fit = fit_start_lightgbm if backend == 'lightgbm' else fit_start_xgboost
+    model, margin_train, margin_test, cv_accuracy, cv_std = fit(
+        splits, X_fit, X_val, y_fit, y_val, n_jobs
+    )
+
+    # Predictions (margin > 0 is P(start) > 0.5)
+    y_pred_train = (margin_train > 0).astype(np.int8)
+    y_pred_test = (margin_test > 0).astype(np.int8)
+
+    # Evaluate (AUC is invariant to the sigmoid, so feed margins)
     train_acc = accuracy_score(splits['start']['y_train'], y_pred_train)
     test_acc = accuracy_score(splits['start']['y_test'], y_pred_test)
-    auc_score = roc_auc_score(splits['start']['y_test'], y_pred_proba_test)
+    auc_score = roc_auc_score(splits['start']['y_test'], margin_test)
 
     precision, recall, f1, _ = precision_recall_fscore_support(
         splits['start']['y_test'],
@@ -174,12 +338,6 @@ def train_start_model(splits: Dict) -> Tuple:
         average='binary'
     )
 
-    # Cross-validation
-    cv_scores = cross_val_score(
-        model, splits['start']['X_train'], splits['start']['y_train'],
-        cv=5, scoring='accuracy'
-    )
-
     metrics = {
         'train_accuracy': train_acc,
         'test_accuracy': test_acc,
@@ -187,8 +345,8 @@ def train_start_model(splits: Dict) -> Tuple:
         'precision': precision,
         'recall': recall,
         'f1_score': f1,
-        'cv_mean': cv_scores.mean(),
-        'cv_std': cv_scores.std(),
+        'cv_mean': cv_accuracy,
+        'cv_std': cv_std,
     }
 
     print(f"  [OK] Model trained!")
@@ -198,66 +356,143 @@ def train_start_model(splits: Dict) -> Tuple:
     print(f"     Precision:      {precision:.2%}")
     print(f"     Recall:         {recall:.2%}")
     print(f"     F1 Score:       {f1:.3f}")
-    print(f"     CV Accuracy:    {cv_scores.mean():.2%} ± {cv_scores.std():.2%}")
+    print(f"     CV Accuracy:    {cv_accuracy:.2%} ± {cv_std:.2%}")
 
     # Feature importance (top 10)
-    feature_importance = pd.DataFrame({
-        'feature': splits['start']['X_train'].columns,
-        'importance': model.feature_importances_
-    }).sort_values('importance', ascending=False)
+    print_top_features(model.feature_importances_, splits['start']['feature_names'])
 
-    print(f"\n  [STATS] Top 10 Most Important Features:")
-    for idx, row in feature_importance.head(10).iterrows():
-        print(f"     {row['feature']}: {row['importance']:.4f}")
+    return model, None, metrics, margin_test
 
-    return model, None, metrics
+
+def regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float, float]:
+    """
+    MAE, RMSE and R² from a single residual vector.
+    """
+    y_true = y_true.astype(np.float64)
+    err = y_true - y_pred
+    sq = err * err
+    centered = y_true - y_true.mean()
+
+    mae = float(np.abs(err).mean())
+    rmse = float(np.sqrt(sq.mean()))
+    r2 = float(1 - sq.sum() / (centered * centered).sum())
+    return mae, rmse, r2
 
 
-def train_minutes_model(splits: Dict) -> Tuple:
+def fit_minutes_xgboost(splits: Dict, X_fit, X_val, y_fit, y_val, n_jobs: int) -> Tuple:
     """
-    Train Stage 2: XGBoost Regressor for E[minutes | start].
+    Fit the XGBoost minutes regressor and cross-validate it.
 
     Returns:
-        Trained model, None (no scaler needed), and metrics
+        Model, train/test predictions, CV MAE mean and std
     """
-    print("\n[MODEL] Training Stage 2: Minutes Prediction Model (XGBoost)...")
-
     # Train XGBoost Regressor with optimized hyperparameters
+    device = xgb_device(len(splits['minutes']['X_train']))
+    print(f"  Device: {device}")
     model = xgb.XGBRegressor(
         max_depth=4,
         learning_rate=0.05,
         n_estimators=200,
         min_child_weight=3,
         subsample=0.8,
+        tree_method='hist',  # Bin features once, reuse histograms every round
+        device=device,
+        grow_policy='depthwise',
+        max_bin=256,
+        n_jobs=n_jobs,
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
         random_state=42,
         objective='reg:squarederror',
     )
 
-    model.fit(splits['minutes']['X_train'], splits['minutes']['y_train'])
+    model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    best_rounds = (0, model.best_iteration + 1)
+    print(f"  Early stopping kept {model.best_iteration + 1}/{model.n_estimators} trees")
+
+    # One DMatrix per split, reused for every prediction and the CV below
+    dtrain = xgb.DMatrix(splits['minutes']['X_train'], label=splits['minutes']['y_train'])
+    dtest = xgb.DMatrix(splits['minutes']['X_test'], label=splits['minutes']['y_test'])
+    booster = model.get_booster()
+
+    y_pred_train = booster.predict(dtrain, iteration_range=best_rounds)
+    y_pred_test = booster.predict(dtest, iteration_range=best_rounds)
+
+    # Cross-validation on the training DMatrix (features binned once, shared by all folds)
+    cv_results = xgb.cv(
+        model.get_xgb_params(), dtrain,
+        num_boost_round=model.best_iteration + 1, nfold=5,
+        metrics='mae', seed=42,
+    )
+    cv_mae = cv_results['test-mae-mean'].iloc[-1]
+    cv_mae_std = cv_results['test-mae-std'].iloc[-1]
+
+    return model, y_pred_train, y_pred_test, cv_mae, cv_mae_std
+
+
+def fit_minutes_lightgbm(splits: Dict, X_fit, X_val, y_fit, y_val, n_jobs: int) -> Tuple:
+    """
+    Fit the LightGBM minutes regressor and cross-validate it.
+
+    Returns:
+        Model, train/test predictions, CV MAE mean and std
+    """
+    params = {
+        'objective': 'regression',
+        'learning_rate': 0.05,
+        'num_leaves': 15,
+        'min_child_samples': 20,  # min_data_in_leaf
+        'device_type': 'cpu',  # GPU LightGBM is slower at this data size
+        'random_state': 42,
+        'verbose': -1,
+    }
+    model = lgb.LGBMRegressor(n_estimators=200, n_jobs=n_jobs, **params)
+
+    model.fit(
+        X_fit, y_fit, eval_set=[(X_val, y_val)],
+        callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+    )
+    print(f"  Early stopping kept {model.best_iteration_}/{model.n_estimators} trees")
 
-    # Predictions
+    # predict stops at best_iteration_ by default
     y_pred_train = model.predict(splits['minutes']['X_train'])
     y_pred_test = model.predict(splits['minutes']['X_test'])
 
-    # Clip predictions to valid range [0, 90]
-    y_pred_test_clipped = np.clip(y_pred_test, 0, 90)
+    cv_results = lgb.cv(
+        {**params, 'num_threads': n_jobs, 'metric': 'l1'},
+        lgb.Dataset(splits['minutes']['X_train'], label=splits['minutes']['y_train']),
+        num_boost_round=model.best_iteration_, nfold=5, stratified=False, seed=42,
+    )
+    cv_mae = cv_results['valid l1-mean'][-1]
+    cv_mae_std = cv_results['valid l1-stdv'][-1]
 
-    # Evaluate
-    train_mae = mean_absolute_error(splits['minutes']['y_train'], y_pred_train)
-    test_mae = mean_absolute_error(splits['minutes']['y_test'], y_pred_test_clipped)
+    return model, y_pred_train, y_pred_test, cv_mae, cv_mae_std
 
-    train_rmse = np.sqrt(mean_squared_error(splits['minutes']['y_train'], y_pred_train))
-    test_rmse = np.sqrt(mean_squared_error(splits['minutes']['y_test'], y_pred_test_clipped))
 
-    train_r2 = r2_score(splits['minutes']['y_train'], y_pred_train)
-    test_r2 = r2_score(splits['minutes']['y_test'], y_pred_test_clipped)
+def train_minutes_model(splits: Dict, n_jobs: int = -1, backend: str = 'xgboost') -> Tuple:
+    """
+    Train Stage 2: XGBoost (or LightGBM) Regressor for E[minutes | start].
 
-    # Cross-validation
-    cv_scores = cross_val_score(
-        model, splits['minutes']['X_train'], splits['minutes']['y_train'],
-        cv=5, scoring='neg_mean_absolute_error'
+    Returns:
+        Trained model, None (no scaler needed), and metrics
+    """
+    print(f"\n[MODEL] Training Stage 2: Minutes Prediction Model ({BACKEND_NAMES[backend]})...")
+
+    # Early-stop on an inner validation slice of the training rows
+    X_fit, X_val, y_fit, y_val = early_stopping_split(
+        splits['minutes']['X_train'], splits['minutes']['y_train']
+    )
+    fit = fit_minutes_lightgbm if backend == 'lightgbm' else fit_minutes_xgboost
+    model, y_pred_train, y_pred_test, cv_mae, cv_mae_std = fit(
+        splits, X_fit, X_val, y_fit, y_val, n_jobs
     )
 
+    # Clip predictions to valid range [0, 90]
+    y_pred_test_clipped = np.clip(y_pred_test, 0, 90)
+
+    # Evaluate
+    train_mae, train_rmse, train_r2 = regression_metrics(splits['minutes']['y_train'], y_pred_train)
+    test_mae, test_rmse, test_r2 = regression_metrics(splits['minutes']['y_test'], y_pred_test_clipped)
+
     metrics = {
         'train_mae': train_mae,
         'test_mae': test_mae,
@@ -265,8 +500,8 @@ def train_minutes_model(splits: Dict) -> Tuple:
         'test_rmse': test_rmse,
         'train_r2': train_r2,
         'test_r2': test_r2,
-        'cv_mae_mean': -cv_scores.mean(),
-        'cv_mae_std': cv_scores.std(),
+        'cv_mae_mean': cv_mae,
+        'cv_mae_std': cv_mae_std,
     }
 
     print(f"  [OK] Model trained!")
@@ -276,27 +511,50 @@ def train_minutes_model(splits: Dict) -> Tuple:
     print(f"     Test RMSE:  {test_rmse:.2f} minutes")
     print(f"     Train R²:   {train_r2:.3f}")
     print(f"     Test R²:    {test_r2:.3f}")
-    print(f"     CV MAE:     {-cv_scores.mean():.2f} ± {cv_scores.std():.2f} minutes")
+    print(f"     CV MAE:     {cv_mae:.2f} ± {cv_mae_std:.2f} minutes")
 
     # Feature importance (top 10)
-    feature_importance = pd.DataFrame({
-        'feature': splits['minutes']['X_train'].columns,
-        'importance': model.feature_importances_
-    }).sort_values('importance', ascending=False)
-
-    print(f"\n  [STATS] Top 10 Most Important Features:")
-    for idx, row in feature_importance.head(10).iterrows():
-        print(f"     {row['feature']}: {row['importance']:.4f}")
+    print_top_features(model.feature_importances_, splits['minutes']['feature_names'])
 
     return model, None, metrics
 
 
-def calculate_combined_accuracy(splits: Dict, start_model, start_scaler, minutes_model, minutes_scaler, df_full: pd.DataFrame = None) -> Dict:
+@njit(parallel=True, fastmath=True, cache=True)
+def combine_xmins(start_proba, minutes_pred, actual, thresholds):
+    """
+    Fused xMins = P(start) × clip(minutes, 0, 90) with its MAE and the
+    fraction of rows within each threshold.
+    """
+    n = start_proba.shape[0]
+    xmins = np.empty(n)
+    abs_error = np.empty(n)
+    total_error = 0.0
+    for i in prange(n):
+        xmins[i] = start_proba[i] * min(max(minutes_pred[i], 0.0), 90.0)
+        abs_error[i] = abs(actual[i] - xmins[i])
+        total_error += abs_error[i]
+
+    accuracies = np.empty(thresholds.shape[0])
+    for t in range(thresholds.shape[0]):
+        hits = 0
+        for i in prange(n):
+            if abs_error[i] <= thresholds[t]:
+                hits += 1
+        accuracies[t] = hits / n
+
+    return xmins, total_error / n, accuracies
+
+
+def calculate_combined_accuracy(splits: Dict, start_model, start_scaler, minutes_model, minutes_scaler,
+                                df_full: pd.DataFrame = None, start_margin: np.ndarray = None) -> Dict:
     """
     Calculate end-to-end accuracy: combined xMins = P(start) × E[minutes | start]
 
     This is the metric that matters for FPL decision-making.
     Evaluates at multiple thresholds: ±20, ±25, ±30 minutes.
+
+    start_margin: optional Stage 1 test margins already computed by
+    train_start_model, so the start model isn't scored twice.
     """
     print("\n[STATS] Calculating Combined xMins Accuracy...")
 
@@ -304,22 +562,33 @@ def calculate_combined_accuracy(splits: Dict, start_model, start_scaler, minutes
     X_start_test = splits['start']['X_test']
     y_start_test = splits['start']['y_test']
 
-    # Stage 1: Predict start probability
-    start_proba = start_model.predict_proba(X_start_test)[:, 1]
+    if isinstance(start_model, xgb.XGBModel):
+        # One DMatrix shared by both stages' boosters
+        dtest = xgb.DMatrix(X_start_test)
 
-    # Stage 2: Predict minutes for all (as if they started)
-    predicted_minutes = minutes_model.predict(X_start_test)
-    predicted_minutes = np.clip(predicted_minutes, 0, 90)
+        # Stage 1: Predict start probability (raw margin, reused if cached)
+        if start_margin is None:
+            start_margin = start_model.get_booster().predict(
+                dtest, output_margin=True, iteration_range=(0, start_model.best_iteration + 1)
+            )
 
-    # Combined: xMins = P(start) × E[minutes | start]
-    xmins_predicted = start_proba * predicted_minutes
+        # Stage 2: Predict minutes for all (as if they started)
+        predicted_minutes = minutes_model.get_booster().predict(
+            dtest, iteration_range=(0, minutes_model.best_iteration + 1)
+        )
+    else:
+        if start_margin is None:
+            start_margin = start_model.predict(X_start_test, raw_score=True)
+        predicted_minutes = minutes_model.predict(X_start_test)
+
+    start_proba = 1.0 / (1.0 + np.exp(-start_margin))
 
     # Get actual minutes from the full dataset using test indices
     # Reconstruct actual minutes: 0 if didn't start, actual minutes if started
     if df_full is not None:
         # Get test indices (this is approximate - ideally we'd track indices)
         # For now, use the simple approximation
-        actual_minutes = y_start_test.values.astype(float)
+        actual_minutes = y_start_test.astype(float)
         # Multiply by average minutes when started (from training data)
         avg_minutes_if_started = splits['minutes']['y_train'].mean()
         actual_minutes = actual_minutes * avg_minutes_if_started
@@ -327,17 +596,19 @@ def calculate_combined_accuracy(splits: Dict, start_model, start_scaler, minutes
         # Fallback: assume 80 minutes if started
         actual_minutes = y_start_test * 80
 
-    # Calculate MAE
-    mae = mean_absolute_error(actual_minutes, xmins_predicted)
-
-    # Calculate accuracy at multiple thresholds
+    # Combined: xMins = P(start) × E[minutes | start], with MAE and every
+    # threshold accuracy computed in the same compiled pass
     thresholds = [20, 25, 30]
-    accuracy_metrics = {}
-
-    for threshold in thresholds:
-        within_tolerance = np.abs(actual_minutes - xmins_predicted) <= threshold
-        accuracy = within_tolerance.mean()
-        accuracy_metrics[f'accuracy_within_{threshold}min'] = accuracy
+    xmins_predicted, mae, accuracies = combine_xmins(
+        start_proba.astype(np.float64),
+        predicted_minutes.astype(np.float64),
+        np.asarray(actual_minutes, dtype=np.float64),
+        np.array(thresholds, dtype=np.float64),
+    )
+    accuracy_metrics = {
+        f'accuracy_within_{threshold}min': float(accuracy)
+        for threshold, accuracy in zip(thresholds, accuracies)
+    }
 
     metrics = {
         'combined_mae': mae,
@@ -359,17 +630,26 @@ def calculate_combined_accuracy(splits: Dict, start_model, start_scaler, minutes
     return metrics
 
 
-def save_models(start_model, start_scaler, minutes_model, minutes_scaler, config: Dict, all_metrics: Dict):
+def save_models(start_model, start_scaler, minutes_model, minutes_scaler, config: Dict, all_metrics: Dict,
+                backend: str = 'xgboost'):
     """
     Save trained models and metadata.
     """
     print("\n[SAVED] Saving models...")
 
-    # Save models
-    joblib.dump(start_model, MODEL_DIR / "start_model.pkl")
-    joblib.dump(start_scaler, MODEL_DIR / "start_scaler.pkl")
-    joblib.dump(minutes_model, MODEL_DIR / "minutes_model.pkl")
-    joblib.dump(minutes_scaler, MODEL_DIR / "minutes_scaler.pkl")
+    # Save models (tree models need no scalers, so none are written).
+    # XGBoost models use the native UBJSON format: smaller than a pickle, faster
+    # to load and independent of the sklearn/xgboost versions at load time.
+    if backend == 'xgboost':
+        start_model.save_model(str(MODEL_DIR / "start_model.ubj"))
+        minutes_model.save_model(str(MODEL_DIR / "minutes_model.ubj"))
+    else:
+        joblib.dump(start_model, MODEL_DIR / "start_model.pkl", compress=('lz4', 3))
+        joblib.dump(minutes_model, MODEL_DIR / "minutes_model.pkl", compress=('lz4', 3))
+
+    # Feature order for rebuilding model inputs without the full metadata
+    with open(MODEL_DIR / "feature_names.json", 'w') as f:
+        json.dump({'start': config['start_features'], 'minutes': config['minutes_features']}, f, indent=2)
 
     print(f"  [OK] Saved models to {MODEL_DIR}")
 
@@ -390,12 +670,14 @@ def save_models(start_model, start_scaler, minutes_model, minutes_scaler, config
     # Save metadata
     metadata = {
         'model_version': 'v1.0',
-        'model_type': 'xgboost_classifier_regressor',
+        'model_type': f'{backend}_classifier_regressor',
         'trained_at': pd.Timestamp.now().isoformat(),
         'feature_config': config,
         'metrics': convert_to_python_types(all_metrics),
         'xgboost_version': xgb.__version__,
     }
+    if backend == 'lightgbm':
+        metadata['lightgbm_version'] = lgb.__version__
 
     with open(MODEL_DIR / "model_metadata.json", 'w') as f:
         json.dump(metadata, f, indent=2)
@@ -418,6 +700,13 @@ def main():
     if exclude_outliers:
         print("[MODE] Excluding outliers from training (target: higher accuracy)")
 
+    # Check for --lightgbm flag
+    backend = 'lightgbm' if '--lightgbm' in sys.argv else 'xgboost'
+    if backend == 'lightgbm':
+        if not HAS_LIGHTGBM:
+            raise ImportError("--lightgbm requires LightGBM. Install with: pip install lightgbm")
+        print("[MODE] Training with LightGBM backend")
+
     try:
         # Load data
         df, config = load_training_data()
@@ -433,15 +722,19 @@ def main():
         # Prepare train/test splits
         splits = prepare_train_test_split(df, config, test_size=0.2)
 
-        # Train Stage 1: Start Probability
-        start_model, start_scaler, start_metrics = train_start_model(splits)
-
-        # Train Stage 2: Minutes Prediction
-        minutes_model, minutes_scaler, minutes_metrics = train_minutes_model(splits)
+        # Train Stage 1 (Start Probability) and Stage 2 (Minutes Prediction)
+        # concurrently; each process gets half the cores to avoid oversubscription
+        n_jobs = max(1, (os.cpu_count() or 2) // 2)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            start_future = executor.submit(train_start_model, splits, n_jobs, backend)
+            minutes_future = executor.submit(train_minutes_model, splits, n_jobs, backend)
+            start_model, start_scaler, start_metrics, start_margin_test = start_future.result()
+            minutes_model, minutes_scaler, minutes_metrics = minutes_future.result()
 
         # Calculate combined accuracy
         combined_metrics = calculate_combined_accuracy(
-            splits, start_model, start_scaler, minutes_model, minutes_scaler
+            splits, start_model, start_scaler, minutes_model, minutes_scaler,
+            start_margin=start_margin_test
         )
 
         # Combine all metrics
@@ -452,7 +745,7 @@ def main():
         }
 
         # Save models
-        save_models(start_model, start_scaler, minutes_model, minutes_scaler, config, all_metrics)
+        save_models(start_model, start_scaler, minutes_model, minutes_scaler, config, all_metrics, backend)
 
         print("\n[OK] Model training complete!")
         print(f"\n[STATS] Final Performance Summary:")
@@ -7,7 +7,9 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
-import joblib
+import os
+import tempfile
+from joblib import Parallel, delayed
 
 import xgboost as xgb
 import lightgbm as lgb
@@ -15,61 +17,78 @@ import catboost as cb
 
 from sklearn.model_selection import train_test_split, KFold
 from sklearn.metrics import mean_absolute_error
-from sklearn.linear_model import Ridge
 from sklearn.ensemble import RandomForestRegressor
 
+from training_utils import XGB_DEVICE, LGB_DEVICE, CAT_DEVICE, n_parallel, inner_threads, squad_depth, cached_frame
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 MODEL_DIR = Path(__file__).parent.parent / "models"
 
 
-def load_training_data():
-    """Load feature-engineered data with advanced features."""
-    data_path = DATA_DIR / "training_data_features.csv"
-    config_path = DATA_DIR / "feature_config.json"
-
-    df = pd.read_csv(data_path)
-    df = df[df['is_outlier_event'] == 0].copy()
-
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-
+def build_advanced_features(df):
+    """Add squad depth and manager profile features to the outlier-free frame."""
     # Add squad depth features
     print("[BUILD] Computing squad depth...")
     df = df.sort_values(['team', 'position', 'season', 'gameweek'])
 
-    squad_depth = []
-    for idx, row in df.iterrows():
-        recent_players = df[
-            (df['team'] == row['team']) &
-            (df['position'] == row['position']) &
-            (df['season'] == row['season']) &
-            (df['gameweek'] >= row['gameweek'] - 5) &
-            (df['gameweek'] < row['gameweek']) &
-            (df['minutes'] > 0)
-        ]['fpl_id'].nunique()
-        squad_depth.append(recent_players)
-
-    df['squad_depth_position'] = squad_depth
+    df['squad_depth_position'] = squad_depth(df)
     df['high_squad_depth'] = (df['squad_depth_position'] >= 3).astype(int)
 
     # Add manager profiles
     print("[BUILD] Computing manager profiles...")
-    team_profiles = {}
-    for team in df['team'].unique():
-        team_data = df[df['team'] == team]
-        starters = team_data[team_data['started'] == True]
-
-        if len(starters) > 0:
-            early_sub_rate = (starters['minutes'] < 75).mean()
-            full_game_rate = (starters['minutes'] >= 85).mean()
-            team_profiles[team] = {'early_sub_rate': early_sub_rate, 'full_game_rate': full_game_rate}
-        else:
-            team_profiles[team] = {'early_sub_rate': 0.25, 'full_game_rate': 0.60}
-
-    df['manager_early_sub_rate'] = df['team'].map(lambda x: team_profiles.get(x, {}).get('early_sub_rate', 0.25))
-    df['manager_full_game_rate'] = df['team'].map(lambda x: team_profiles.get(x, {}).get('full_game_rate', 0.60))
+    # One grouped pass over the starters: % subbed before 75 min, % playing 85+.
+    # Teams without starters fall back to league-typical rates.
+    started_mask = df['started'].to_numpy(dtype=bool)
+    starters = df.loc[started_mask, ['team', 'minutes']]
+    team_profiles = (
+        starters.assign(early=starters['minutes'].lt(75), full=starters['minutes'].ge(85))
+        .groupby('team', sort=False)[['early', 'full']]
+        .mean()
+        .rename(columns={'early': 'manager_early_sub_rate', 'full': 'manager_full_game_rate'})
+        .reindex(df['team'].unique())
+        .fillna({'manager_early_sub_rate': 0.25, 'manager_full_game_rate': 0.60})
+    )
+    df = df.merge(team_profiles, left_on='team', right_index=True, how='left')
     df['high_rotation_manager'] = (df['manager_early_sub_rate'] > 0.30).astype(int)
 
+    return df
+
+
+def load_training_data():
+    """
+    Load feature-engineered data with advanced features.
+
+    The built frame is cached as Parquet, keyed on the CSV, the config (which
+    picks the parsed columns) and this script, skipping the CSV parse and both
+    feature builds on reruns.
+    """
+    data_path = DATA_DIR / "training_data_features.csv"
+    config_path = DATA_DIR / "feature_config.json"
+
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+
+    def build():
+        # Parse only the columns the features, targets and builds use
+        needed = (
+            set(config['start_features']) | set(config['minutes_features'])
+            | set(config['targets'].values())
+            | {'team', 'position', 'season', 'gameweek', 'minutes', 'fpl_id', 'is_outlier_event', 'started'}
+        )
+        header = pd.read_csv(data_path, nrows=0).columns
+        df = pd.read_csv(data_path, usecols=[c for c in header if c in needed], engine='pyarrow')
+        # No copy needed: the feature build's sort returns a fresh frame
+        df = build_advanced_features(df[df['is_outlier_event'] == 0])
+
+        # The boosters bin in float32; 0/1 indicators fit in int8
+        float_cols = df.select_dtypes('float64').columns
+        df[float_cols] = df[float_cols].astype(np.float32)
+        indicator_cols = ['high_squad_depth', 'high_rotation_manager', config['targets']['start']]
+        df[indicator_cols] = df[indicator_cols].astype(np.int8)
+        return df
+
+    df = cached_frame('training_stacked', build, data_path, config_path, Path(__file__))
+
     # Update config
     advanced_features = ['squad_depth_position', 'high_squad_depth',
                          'manager_early_sub_rate', 'manager_full_game_rate',
@@ -81,6 +100,47 @@ def load_training_data():
     return df, config
 
 
+def fit_fold(X_np, y_np, train_idx, val_idx, n_threads):
+    """
+    Fit the three minutes base learners on one CV fold.
+
+    Returns:
+        (xgb, lgb, cat) predictions for val_idx, then the three fitted models
+    """
+    X_fold_train, X_fold_val = X_np[train_idx], X_np[val_idx]
+    y_fold_train = y_np[train_idx]
+
+    # XGBoost (native API: quantize the fold once, reuse the cuts for val)
+    dtrain = xgb.QuantileDMatrix(X_fold_train, label=y_fold_train)
+    dval = xgb.QuantileDMatrix(X_fold_val, ref=dtrain)
+    xgb_model = xgb.train({
+        'objective': 'reg:squarederror', 'max_depth': 4, 'learning_rate': 0.05,
+        'min_child_weight': 5, 'subsample': 0.8, 'colsample_bytree': 0.8,
+        'seed': 42, **XGB_DEVICE, 'n_jobs': n_threads,
+    }, dtrain, num_boost_round=200)
+
+    # LightGBM (native API: one binned Dataset per fold)
+    lgb_model = lgb.train({
+        'objective': 'regression', 'max_depth': 4, 'learning_rate': 0.05,
+        'num_leaves': 15, 'subsample': 0.8,
+        'seed': 42, 'verbose': -1, 'num_threads': n_threads, **LGB_DEVICE,
+    }, lgb.Dataset(X_fold_train, label=y_fold_train, free_raw_data=False), num_boost_round=250)
+
+    # CatBoost
+    cat_model = cb.CatBoostRegressor(
+        depth=4, learning_rate=0.05, iterations=250, thread_count=n_threads,
+        random_state=42, verbose=False, **CAT_DEVICE
+    )
+    cat_model.fit(X_fold_train, y_fold_train)
+
+    return (
+        xgb_model.predict(dval),
+        lgb_model.predict(X_fold_val),
+        cat_model.predict(X_fold_val),
+        xgb_model, lgb_model, cat_model,
+    )
+
+
 def train_base_models_with_cv(X_train, y_train, n_folds=5):
     """
     Train base models using cross-validation to generate out-of-fold predictions.
@@ -88,51 +148,48 @@ def train_base_models_with_cv(X_train, y_train, n_folds=5):
     """
     print("\n[STACK] Training base models with cross-validation...")
 
+    # Contiguous float32 arrays: row slicing per fold is a plain numpy gather
+    X_np = np.ascontiguousarray(X_train.to_numpy(dtype=np.float32))
+    y_np = y_train.to_numpy(dtype=np.float32)
+
     kf = KFold(n_splits=n_folds, shuffle=True, random_state=42)
+    folds = list(kf.split(X_np))
+
+    # Folds are independent: fit them in parallel worker processes, splitting
+    # the cores between them (a single GPU serializes fits anyway)
+    n_fold_jobs = n_parallel(min(n_folds, os.cpu_count() or 1))
+    print(f"  Training {n_folds} folds across {n_fold_jobs} workers...")
+
+    # Hand workers read-only memmaps of one on-disk copy instead of pickling
+    # the training arrays into every process
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        X_path, y_path = Path(tmp_dir) / "X_minutes.npy", Path(tmp_dir) / "y_minutes.npy"
+        np.save(X_path, X_np)
+        np.save(y_path, y_np)
+        X_mm = np.load(X_path, mmap_mode='r')
+        y_mm = np.load(y_path, mmap_mode='r')
+
+        results = Parallel(n_jobs=n_fold_jobs, backend='loky')(
+            delayed(fit_fold)(X_mm, y_mm, train_idx, val_idx, inner_threads(n_fold_jobs))
+            for train_idx, val_idx in folds
+        )
+        del X_mm, y_mm
 
-    # Store out-of-fold predictions
+    # Store out-of-fold predictions and trained models in fold order
     oof_xgb = np.zeros(len(X_train))
     oof_lgb = np.zeros(len(X_train))
     oof_cat = np.zeros(len(X_train))
 
-    # Store trained models
     xgb_models = []
     lgb_models = []
     cat_models = []
 
-    for fold, (train_idx, val_idx) in enumerate(kf.split(X_train)):
-        print(f"  Training fold {fold + 1}/{n_folds}...")
-
-        X_fold_train, X_fold_val = X_train.iloc[train_idx], X_train.iloc[val_idx]
-        y_fold_train, y_fold_val = y_train.iloc[train_idx], y_train.iloc[val_idx]
-
-        # XGBoost
-        xgb_model = xgb.XGBRegressor(
-            max_depth=4, learning_rate=0.05, n_estimators=200,
-            min_child_weight=5, subsample=0.8, colsample_bytree=0.8,
-            random_state=42, objective='reg:squarederror'
-        )
-        xgb_model.fit(X_fold_train, y_fold_train)
-        oof_xgb[val_idx] = xgb_model.predict(X_fold_val)
+    for (train_idx, val_idx), (xgb_pred, lgb_pred, cat_pred, xgb_model, lgb_model, cat_model) in zip(folds, results):
+        oof_xgb[val_idx] = xgb_pred
+        oof_lgb[val_idx] = lgb_pred
+        oof_cat[val_idx] = cat_pred
         xgb_models.append(xgb_model)
-
-        # LightGBM
-        lgb_model = lgb.LGBMRegressor(
-            max_depth=4, learning_rate=0.05, n_estimators=250,
-            num_leaves=15, subsample=0.8,
-            random_state=42, verbose=-1
-        )
-        lgb_model.fit(X_fold_train, y_fold_train)
-        oof_lgb[val_idx] = lgb_model.predict(X_fold_val)
         lgb_models.append(lgb_model)
-
-        # CatBoost
-        cat_model = cb.CatBoostRegressor(
-            depth=4, learning_rate=0.05, iterations=250,
-            random_state=42, verbose=False
-        )
-        cat_model.fit(X_fold_train, y_fold_train)
-        oof_cat[val_idx] = cat_model.predict(X_fold_val)
         cat_models.append(cat_model)
 
     print(f"  [OK] Base models trained with {n_folds}-fold CV")
@@ -149,6 +206,32 @@ def train_base_models_with_cv(X_train, y_train, n_folds=5):
     }
 
 
+class RidgeMetaLearner:
+    """
+    Ridge regression over the three base-model columns, solved in closed form.
+    Matches sklearn's Ridge: the intercept is fit on centered data, unpenalized.
+    """
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        X_mean, y_mean = X.mean(axis=0), y.mean()
+        Xc = X - X_mean
+
+        # (XcᵀXc + αI) w = Xcᵀ(y - ȳ): a single 3×3 solve
+        gram = Xc.T @ Xc
+        gram[np.diag_indices_from(gram)] += self.alpha
+        self.coef_ = np.linalg.solve(gram, Xc.T @ (y - y_mean))
+        self.intercept_ = float(y_mean - X_mean @ self.coef_)
+        return self
+
+    def predict(self, X):
+        return np.asarray(X) @ self.coef_ + self.intercept_
+
+
 def train_meta_learner(oof_predictions, y_train):
     """
     Train meta-learner on out-of-fold predictions.
@@ -164,8 +247,7 @@ def train_meta_learner(oof_predictions, y_train):
     ])
 
     # Try Ridge regression (linear combination with regularization)
-    meta_model = Ridge(alpha=1.0)
-    meta_model.fit(X_meta, y_train)
+    meta_model = RidgeMetaLearner(alpha=1.0).fit(X_meta, y_train)
 
     print(f"  [OK] Meta-learner trained")
     print(f"     Learned weights: XGB={meta_model.coef_[0]:.3f}, LGB={meta_model.coef_[1]:.3f}, CAT={meta_model.coef_[2]:.3f}")
@@ -174,15 +256,32 @@ def train_meta_learner(oof_predictions, y_train):
     return meta_model
 
 
+def fold_average(models, X_test):
+    """
+    Average fold models' predictions into one preallocated float32 buffer.
+    """
+    # XGBoost boosters share one DMatrix across every fold
+    data = xgb.DMatrix(X_test) if isinstance(models[0], xgb.Booster) else X_test
+
+    total = np.zeros(len(X_test), dtype=np.float32)
+    for model in models:
+        total += model.predict(data)
+    total /= len(models)
+    return total
+
+
 def predict_with_stacked_ensemble(base_models, meta_model, X_test):
     """
     Generate predictions using stacked ensemble.
     Average predictions from all folds, then apply meta-learner.
     """
+    # Base models were fit on float32 arrays in minutes_features order
+    X_test = np.ascontiguousarray(np.asarray(X_test, dtype=np.float32))
+
     # Get predictions from each base model (average across folds)
-    xgb_preds = np.mean([model.predict(X_test) for model in base_models['xgb_models']], axis=0)
-    lgb_preds = np.mean([model.predict(X_test) for model in base_models['lgb_models']], axis=0)
-    cat_preds = np.mean([model.predict(X_test) for model in base_models['cat_models']], axis=0)
+    xgb_preds = fold_average(base_models['xgb_models'], X_test)
+    lgb_preds = fold_average(base_models['lgb_models'], X_test)
+    cat_preds = fold_average(base_models['cat_models'], X_test)
 
     # Stack predictions
     X_meta = np.column_stack([xgb_preds, lgb_preds, cat_preds])
@@ -213,7 +312,7 @@ def train_stacked_models(splits):
         max_depth=4, learning_rate=0.03, n_estimators=200,
         min_child_weight=3, subsample=0.7, colsample_bytree=0.9,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, eval_metric='logloss'
+        random_state=42, eval_metric='logloss', **XGB_DEVICE
     )
     xgb_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
@@ -222,7 +321,7 @@ def train_stacked_models(splits):
         max_depth=6, learning_rate=0.05, n_estimators=200,
         num_leaves=31, subsample=0.8,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=-1
+        random_state=42, verbose=-1, **LGB_DEVICE
     )
     lgb_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
@@ -230,7 +329,7 @@ def train_stacked_models(splits):
     cat_start = cb.CatBoostClassifier(
         depth=6, learning_rate=0.05, iterations=200,
         scale_pos_weight=n_neg / n_pos,
-        random_state=42, verbose=False
+        random_state=42, verbose=False, **CAT_DEVICE
     )
     cat_start.fit(splits['start']['X_train'], splits['start']['y_train'])
 
@@ -271,11 +370,12 @@ def evaluate_stacked_ensemble(splits, models):
     actual_minutes = splits['start']['actual_test'].values
 
     # Stage 1: Start predictions (simple average of classifiers)
-    xgb_start_proba = models['start_models']['xgb'].predict_proba(X_test)[:, 1]
-    lgb_start_proba = models['start_models']['lgb'].predict_proba(X_test)[:, 1]
-    cat_start_proba = models['start_models']['cat'].predict_proba(X_test)[:, 1]
+    # One (3, N) buffer filled row by row, then averaged
+    start_probas = np.empty((3, len(X_test)), dtype=np.float32)
+    for i, name in enumerate(('xgb', 'lgb', 'cat')):
+        start_probas[i] = models['start_models'][name].predict_proba(X_test)[:, 1]
 
-    start_proba = (xgb_start_proba + lgb_start_proba + cat_start_proba) / 3
+    start_proba = start_probas.mean(axis=0)
 
     # Stage 2: Minutes predictions (stacked with meta-learner)
     minutes_pred = predict_with_stacked_ensemble(
@@ -283,10 +383,10 @@ def evaluate_stacked_ensemble(splits, models):
         models['minutes_meta_model'],
         X_test
     )
-    minutes_pred = np.clip(minutes_pred, 0, 90)
+    np.clip(minutes_pred, 0, 90, out=minutes_pred)
 
-    # Combined xMins
-    xmins_predicted = start_proba * minutes_pred
+    # Combined xMins (written over the clipped minutes buffer)
+    xmins_predicted = np.multiply(start_proba, minutes_pred, out=minutes_pred)
 
     # Calculate MAE
     mae = mean_absolute_error(actual_minutes, xmins_predicted)
@@ -301,9 +401,11 @@ def evaluate_stacked_ensemble(splits, models):
     print(f"     Avg actual minutes: {actual_minutes.mean():.1f}")
     print(f"\n  [ACCURACY] Threshold Performance:")
 
-    for threshold in thresholds:
-        within_tolerance = np.abs(actual_minutes - xmins_predicted) <= threshold
-        accuracy = within_tolerance.mean()
+    # One pass for the errors, then every threshold at once via broadcasting
+    abs_err = np.abs(np.asarray(actual_minutes) - xmins_predicted)
+    accuracies = (abs_err[None, :] <= np.asarray(thresholds)[:, None]).mean(axis=1)
+
+    for threshold, accuracy in zip(thresholds, accuracies):
         accuracy_metrics[f'accuracy_within_{threshold}min'] = accuracy
 
         if accuracy >= 0.90 and threshold <= 25:
@@ -320,6 +422,24 @@ def evaluate_stacked_ensemble(splits, models):
     return accuracy_metrics
 
 
+def save_native_model(model, stem):
+    """
+    Save a base learner in its library's native format.
+    Native formats are compact, version-stable and load faster than pickles.
+    """
+    if isinstance(model, xgb.XGBModel):
+        model = model.get_booster()
+    elif isinstance(model, lgb.LGBMModel):
+        model = model.booster_
+
+    if isinstance(model, xgb.Booster):
+        model.save_model(str(MODEL_DIR / f"{stem}.ubj"))
+    elif isinstance(model, lgb.Booster):
+        model.save_model(str(MODEL_DIR / f"{stem}.txt"))
+    else:
+        model.save_model(str(MODEL_DIR / f"{stem}.cbm"), format='cbm')
+
+
 def main():
     """
     Train stacked ensemble for maximum accuracy push toward 90%.
@@ -335,11 +455,11 @@ def main():
     # Prepare splits
     X_start = df[config['start_features']]
     y_start = df[config['targets']['start']]
-    actual_minutes_full = df['minutes'].copy()
+    actual_minutes_full = df['minutes']
 
-    df_started = df[df[config['targets']['start']] == 1].copy()
-    X_minutes = df_started[config['minutes_features']]
-    y_minutes = df_started[config['targets']['minutes']]
+    started = df[config['targets']['start']] == 1
+    X_minutes = df.loc[started, config['minutes_features']]
+    y_minutes = df.loc[started, config['targets']['minutes']]
 
     X_start_train, X_start_test, y_start_train, y_start_test, actual_train, actual_test = train_test_split(
         X_start, y_start, actual_minutes_full, test_size=0.2, random_state=42, stratify=y_start
@@ -372,24 +492,22 @@ def main():
 
     # Save start models
     for name, model in models['start_models'].items():
-        joblib.dump(model, MODEL_DIR / f"{name}_start_stacked.pkl")
+        save_native_model(model, f"{name}_start_stacked")
 
     # Save minutes base models (all folds)
-    for i, model in enumerate(models['minutes_base_models']['xgb_models']):
-        joblib.dump(model, MODEL_DIR / f"xgb_minutes_stacked_fold{i}.pkl")
-    for i, model in enumerate(models['minutes_base_models']['lgb_models']):
-        joblib.dump(model, MODEL_DIR / f"lgb_minutes_stacked_fold{i}.pkl")
-    for i, model in enumerate(models['minutes_base_models']['cat_models']):
-        joblib.dump(model, MODEL_DIR / f"cat_minutes_stacked_fold{i}.pkl")
-
-    # Save meta-learner
-    joblib.dump(models['minutes_meta_model'], MODEL_DIR / "minutes_meta_learner.pkl")
+    for name in ('xgb', 'lgb', 'cat'):
+        for i, model in enumerate(models['minutes_base_models'][f'{name}_models']):
+            save_native_model(model, f"{name}_minutes_stacked_fold{i}")
 
     metadata = {
         'version': 'stacked_v1',
         'ensemble_type': 'stacked_with_meta_learner',
         'meta_learner': 'Ridge',
+        # Meta-learner is four numbers: stored here rather than pickled
+        'meta_weights': dict(zip(['xgb', 'lgb', 'cat'], map(float, models['minutes_meta_model'].coef_))),
+        'meta_intercept': models['minutes_meta_model'].intercept_,
         'cv_folds': 5,
+        'minutes_features': config['minutes_features'],
         'accuracy_metrics': {k: float(v) for k, v in accuracy_metrics.items()},
     }
 
@@ -0,0 +1,154 @@
+"""
+Shared helpers for the training scripts.
+
+Imported as a sibling module (the scripts run as `python scripts/<name>.py`),
+so every script resolves GPU use, thread budgets and the shared test
+split the same way, and share the squad-depth kernel and data caches.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from numba import njit
+from sklearn.model_selection import train_test_split
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# GPU training is opt-in (FPL_USE_GPU=1) and needs a CUDA-enabled xgboost build
+USE_GPU = os.environ.get('FPL_USE_GPU') == '1' and bool(xgb.build_info().get('USE_CUDA'))
+
+# Device settings splatted into the boosters
+XGB_DEVICE = {'tree_method': 'hist', 'device': 'cuda' if USE_GPU else 'cpu'}
+LGB_DEVICE = {'device_type': 'gpu', 'gpu_use_dp': False} if USE_GPU else {}
+CAT_DEVICE = {'task_type': 'GPU', 'devices': '0'} if USE_GPU else {}
+
+
+def n_parallel(n_jobs):
+    """Worker count for joblib fan-out; a single GPU serializes fits anyway."""
+    return 1 if USE_GPU else n_jobs
+
+
+def inner_threads(outer_parallelism):
+    """Threads per fit when `outer_parallelism` fits share the machine."""
+    return max(1, (os.cpu_count() or 1) // outer_parallelism)
+
+
+def cache_path(name, suffix, *inputs):
+    """
+    Path of the `name` cache entry, keyed on the bytes of `inputs`.
+
+    Callers pass every file the entry is derived from: the data, the config
+    and the script that builds it (this module is always part of the key), so
+    editing any of them misses the cache. Entries for `name` under other keys
+    are deleted, so only the current one is kept on disk.
+    """
+    digest = hashlib.md5(Path(__file__).read_bytes())
+    for path in inputs:
+        digest.update(Path(path).read_bytes())
+    path = DATA_DIR / f"{name}_{digest.hexdigest()[:8]}{suffix}"
+
+    for stale in DATA_DIR.glob(f"{name}_*{suffix}"):
+        if stale != path:
+            stale.unlink()
+
+    return path
+
+
+def cached_frame(name, build, *inputs):
+    """Return build(), cached as Parquet under cache_path(name, '.parquet', *inputs)."""
+    path = cache_path(name, '.parquet', *inputs)
+
+    if path.exists():
+        print(f"[CACHE] Loading {name} from {path.name}")
+        return pd.read_parquet(path)
+
+    df = build()
+    df.to_parquet(path, compression='zstd')
+    return df
+
+
+def load_split_index(y_start):
+    """
+    Stratified 80/20 split of the start rows, as index labels.
+
+    Cached per training CSV so reruns skip stratification and the ensemble and
+    ultimate scripts evaluate on the same test rows.
+    """
+    split_path = cache_path('split_idx', '.npz', DATA_DIR / "training_data_features.csv")
+
+    if split_path.exists():
+        idx = np.load(split_path)
+        return idx['train'], idx['test']
+
+    y_sorted = y_start.sort_index()
+    train_idx, test_idx = train_test_split(
+        y_sorted.index.to_numpy(), test_size=0.2, random_state=42, stratify=y_sorted
+    )
+    np.savez(split_path, train=train_idx, test=test_idx)
+    return train_idx, test_idx
+
+
+@njit(cache=True)
+def rolling_unique(group_ids, gameweeks, fpl_ids, played, n_players, window=5):
+    """
+    Count distinct players who played in the same group during the previous
+    `window` gameweeks. Rows must be sorted by group then gameweek.
+    """
+    n = group_ids.shape[0]
+    out = np.zeros(n, dtype=np.int32)
+    counts = np.zeros(n_players, dtype=np.int32)
+    distinct = 0
+    lo = 0
+    hi = 0
+
+    for i in range(n):
+        if i > 0 and group_ids[i] != group_ids[i - 1]:
+            # New group: empty the previous window
+            for j in range(lo, hi):
+                if played[j]:
+                    counts[fpl_ids[j]] -= 1
+            distinct = 0
+            lo = i
+            hi = i
+
+        # Admit earlier gameweeks of this group into the window
+        while hi < i and gameweeks[hi] < gameweeks[i]:
+            if played[hi]:
+                counts[fpl_ids[hi]] += 1
+                if counts[fpl_ids[hi]] == 1:
+                    distinct += 1
+            hi += 1
+
+        # Evict gameweeks that fell out of the window
+        while lo < hi and gameweeks[lo] < gameweeks[i] - window:
+            if played[lo]:
+                counts[fpl_ids[lo]] -= 1
+                if counts[fpl_ids[lo]] == 0:
+                    distinct -= 1
+            lo += 1
+
+        out[i] = distinct
+
+    return out
+
+
+def squad_depth(df):
+    """
+    Distinct players with minutes in the previous 5 gameweeks, per
+    team/position/season. `df` must be sorted by team, position, season,
+    then gameweek.
+    """
+    group_ids = df.groupby(['team', 'position', 'season'], sort=False, observed=True).ngroup().to_numpy(np.int32)
+    player_codes, player_ids = pd.factorize(df['fpl_id'])
+
+    return rolling_unique(
+        group_ids,
+        df['gameweek'].to_numpy(np.int32),
+        player_codes.astype(np.int32),
+        (df['minutes'] > 0).to_numpy(),
+        len(player_ids),
+    )
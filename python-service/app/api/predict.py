@@ -3,6 +3,7 @@ Prediction API
 Orchestrates Stage A and Stage B models to generate xMins predictions
 """
 
+import asyncio
 import pandas as pd
 from typing import Dict, List, Optional
 from app.models.start_probability import get_model as get_stage_a_model
@@ -12,33 +13,19 @@ from app.models.features import build_features_for_prediction
 # TODO: Add Convex client to fetch data
 # For now, we'll use placeholder data
 
-async def predict_xmins(
+def fetch_player_features(
     player_id: str,
     horizon_weeks: int = 1,
     flags: Dict[str, bool] = {},
-) -> Dict:
+) -> Dict[str, any]:
     """
-    Predict xMins for a single player
-
-    Pipeline:
-    1. Fetch player appearances from Convex
-    2. Build features
-    3. Stage A: Predict start probability
-    4. Stage B: Predict minutes given start (+ P90)
-    5. Combine: xMins = startProb * xMinsStart
+    Fetch a player's appearances and build their feature vector
     """
-    stage_a = get_stage_a_model()
-    stage_b = get_stage_b_model()
-
-    # Check if models are trained
-    if not stage_a.is_trained or not stage_b.is_trained:
-        raise RuntimeError("Models not trained. Please train models first via /train endpoint")
-
     # TODO: Fetch real data from Convex
     # For now, return placeholder
 
     # Mock features for demonstration
-    mock_features = {
+    return {
         "num_healthy_starts": 6,
         "weighted_avg_minutes": 82.5,
         "last_3_avg_minutes": 85.0,
@@ -53,23 +40,27 @@ async def predict_xmins(
         "position_encoded": 2,  # MID
     }
 
-    # Stage A: Predict start probability
-    start_prob = stage_a.predict_single(mock_features)
-
-    # Stage B: Predict minutes given start + P90
-    xmins_start, p90 = stage_b.predict_single(mock_features)
-
+def build_prediction(
+    player_id: str,
+    features: Dict[str, any],
+    start_prob: float,
+    xmins_start: float,
+    p90: float,
+) -> Dict:
+    """
+    Combine both stages' outputs into the prediction response with audit trail
+    """
     # Calculate effective xMins
     effective_xmins = start_prob * xmins_start
 
     # Build audit trail
     audit = {
-        "features_used": list(mock_features.keys()),
-        "stage_a_confidence": "high" if mock_features["num_healthy_starts"] >= 5 else "low",
-        "stage_b_confidence": "high" if mock_features["num_healthy_starts"] >= 5 else "low",
+        "features_used": list(features.keys()),
+        "stage_a_confidence": "high" if features["num_healthy_starts"] >= 5 else "low",
+        "stage_b_confidence": "high" if features["num_healthy_starts"] >= 5 else "low",
         "flags": {
-            "role_lock": mock_features["role_lock"],
-            "sparse_data": mock_features["num_healthy_starts"] < 5,
+            "role_lock": features["role_lock"],
+            "sparse_data": features["num_healthy_starts"] < 5,
         },
     }
 
@@ -85,28 +76,111 @@ async def predict_xmins(
         "audit": audit,
     }
 
-async def batch_predict_xmins(
+def predict_xmins_sync(
+    player_id: str,
+    horizon_weeks: int = 1,
+    flags: Dict[str, bool] = {},
+) -> Dict:
+    """
+    Predict xMins for a single player (blocking; see predict_xmins)
+
+    Pipeline:
+    1. Fetch player appearances from Convex
+    2. Build features
+    3. Stage A: Predict start probability
+    4. Stage B: Predict minutes given start (+ P90)
+    5. Combine: xMins = startProb * xMinsStart
+    """
+    # Take each published model once; a concurrent /train swaps in new
+    # instances without touching these
+    stage_a = get_stage_a_model()
+    stage_b = get_stage_b_model()
+
+    # Check if models are trained
+    if not stage_a.is_trained or not stage_b.is_trained:
+        raise RuntimeError("Models not trained. Please train models first via /train endpoint")
+
+    features = fetch_player_features(player_id, horizon_weeks, flags)
+
+    # Stage A: Predict start probability
+    start_prob = stage_a.predict_single(features)
+
+    # Stage B: Predict minutes given start + P90
+    xmins_start, p90 = stage_b.predict_single(features)
+
+    return build_prediction(player_id, features, start_prob, xmins_start, p90)
+
+async def predict_xmins(
+    player_id: str,
+    horizon_weeks: int = 1,
+    flags: Dict[str, bool] = {},
+) -> Dict:
+    """
+    Predict xMins for a single player
+
+    Model scoring is CPU-bound, so it runs in a worker thread to keep the
+    event loop free for other requests. This is safe alongside /train, which
+    fits fresh model instances and swaps them in rather than mutating the
+    ones being read here.
+    """
+    return await asyncio.to_thread(predict_xmins_sync, player_id, horizon_weeks, flags)
+
+def batch_predict_xmins_sync(
     requests: List[Dict],
 ) -> List[Dict]:
     """
-    Batch prediction for multiple players
+    Batch prediction for multiple players (blocking; see batch_predict_xmins)
+
+    All players' features are stacked into one DataFrame so each stage
+    scores the whole batch in a single call.
     """
-    predictions = []
+    stage_a = get_stage_a_model()
+    stage_b = get_stage_b_model()
+
+    # Check if models are trained
+    if not stage_a.is_trained or not stage_b.is_trained:
+        for req in requests:
+            print(f"Failed to predict for player {req.player_id}: Models not trained")
+        return []
+
+    player_ids = []
+    feature_rows = []
 
     for req in requests:
         try:
-            pred = await predict_xmins(
+            feature_rows.append(fetch_player_features(
                 player_id=req.player_id,
                 horizon_weeks=req.horizon_weeks,
                 flags=req.flags or {},
-            )
-            predictions.append(pred)
+            ))
+            player_ids.append(req.player_id)
         except Exception as e:
             # Log error but continue with other predictions
             print(f"Failed to predict for player {req.player_id}: {e}")
             continue
 
-    return predictions
+    if not feature_rows:
+        return []
+
+    features_df = pd.DataFrame(feature_rows)
+
+    # One call per stage for the whole batch
+    start_probs = stage_a.predict(features_df)
+    xmins_starts, p90s = stage_b.predict_minutes(features_df)
+
+    return [
+        build_prediction(player_id, features, float(start_prob), float(xmins_start), float(p90))
+        for player_id, features, start_prob, xmins_start, p90
+        in zip(player_ids, feature_rows, start_probs, xmins_starts, p90s)
+    ]
+
+async def batch_predict_xmins(
+    requests: List[Dict],
+) -> List[Dict]:
+    """
+    Batch prediction for multiple players, scored in a worker thread
+    """
+    return await asyncio.to_thread(batch_predict_xmins_sync, requests)
 
 async def get_prediction_audit(
     player_id: str,
@@ -6,8 +6,8 @@ Fetches data from Convex and trains both Stage A and Stage B models
 import pandas as pd
 from datetime import datetime
 from typing import Dict
-from app.models.start_probability import get_model as get_stage_a_model
-from app.models.minutes_given_start import get_model as get_stage_b_model
+from app.models.start_probability import StartProbabilityModel, publish_model as publish_stage_a_model
+from app.models.minutes_given_start import MinutesGivenStartModel, publish_model as publish_stage_b_model
 from app.models.features import prepare_training_data
 import os
 
@@ -77,14 +77,15 @@ async def train_models(
 
     print(f"Training Stage A with {len(stage_a_data)} samples...")
 
-    # Train Stage A
-    stage_a = get_stage_a_model()
+    # Train fresh instances: the served models keep answering requests on
+    # other threads until the new ones are saved and swapped in
+    stage_a = StartProbabilityModel()
     stage_a_metrics = stage_a.train(stage_a_data)
 
     print(f"Training Stage B with {len(stage_b_data)} samples...")
 
     # Train Stage B
-    stage_b = get_stage_b_model()
+    stage_b = MinutesGivenStartModel(model_type="weibull")
     stage_b_metrics = stage_b.train(stage_b_data)
 
     # Save models
@@ -92,13 +93,18 @@ async def train_models(
     os.makedirs(models_dir, exist_ok=True)
 
     stage_a_path = os.path.join(models_dir, "start_probability.pkl")
+    stage_a_linear_path = os.path.join(models_dir, "start_probability.json")
     stage_b_path = os.path.join(models_dir, "minutes_given_start.pkl")
 
     print("Saving models...")
 
     stage_a.save(stage_a_path)
+    stage_a.export_linear(stage_a_linear_path)
     stage_b.save(stage_b_path)
 
+    publish_stage_a_model(stage_a)
+    publish_stage_b_model(stage_b)
+
     # Return results
     trained_at = datetime.utcnow().isoformat()
 
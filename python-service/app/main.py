@@ -79,6 +79,20 @@ class AuditResponse(BaseModel):
     priors_used: Optional[Dict[str, float]]
     confidence: str  # "high", "medium", "low"
 
+# ===== Startup =====
+
+@app.on_event("startup")
+async def load_models():
+    """
+    Load both stage models once at startup so they stay resident across
+    requests instead of loading on the first prediction
+    """
+    from app.models.start_probability import get_model as get_stage_a_model
+    from app.models.minutes_given_start import get_model as get_stage_b_model
+
+    get_stage_a_model()
+    get_stage_b_model()
+
 # ===== Health Check =====
 
 @app.get("/health")
@@ -184,8 +198,36 @@ async def get_model_info():
             "models_loaded": False,
         }
 
+@app.post("/models/reload")
+async def reload_models():
+    """
+    Reload both models from disk (e.g. after models were retrained elsewhere)
+    """
+    try:
+        from app.models.start_probability import reload_model as reload_stage_a
+        from app.models.minutes_given_start import reload_model as reload_stage_b
+
+        reload_stage_a()
+        reload_stage_b()
+
+        return await get_model_info()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
+
+    # uvloop/httptools come with uvicorn[standard]. Each worker process holds
+    # its own copy of the models, and /train or /models/reload only updates
+    # the worker that served it, so scale out with WEB_CONCURRENCY only when
+    # models are trained offline
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        loop="uvloop",
+        http="httptools",
+    )
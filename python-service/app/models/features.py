@@ -5,9 +5,38 @@ Transforms raw appearance data into ML features
 
 import pandas as pd
 import numpy as np
+from numba import njit
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
+# Exponential recency decay: most recent appearance gets the highest weight
+RECENCY_ALPHA = 0.8
+
+# Normalized weight vectors for every window length up to the max, built once
+_MAX_RECENCY_WINDOW = 32
+_RECENCY_DECAY = RECENCY_ALPHA ** np.arange(_MAX_RECENCY_WINDOW)
+_RECENCY_WEIGHTS = [_RECENCY_DECAY[:count] / _RECENCY_DECAY[:count].sum() for count in range(1, _MAX_RECENCY_WINDOW + 1)]
+for _weights in _RECENCY_WEIGHTS:
+    _weights.setflags(write=False)
+
+# Column layout of the feature records built by prepare_training_data
+FEATURE_DTYPE = np.dtype([
+    ("num_healthy_starts", "i8"),
+    ("has_data", "?"),
+    ("use_prior", "?"),
+    ("weighted_avg_minutes", "f8"),
+    ("last_3_avg_minutes", "f8"),
+    ("last_5_avg_minutes", "f8"),
+    ("minutes_std", "f8"),
+    ("role_lock", "?"),
+    ("start_frequency", "f8"),
+    ("congestion_flag", "?"),
+    ("intl_window_flag", "?"),
+    ("avg_days_rest", "f8"),
+    ("viable_backups", "i8"),
+    ("position_encoded", "i8"),
+])
+
 def extract_healthy_starts(
     appearances: pd.DataFrame,
     exclude_injury: bool = True,
@@ -17,27 +46,26 @@ def extract_healthy_starts(
     """
     Filter appearances to only healthy starts
     """
-    df = appearances.copy()
-
-    # Filter for starts only
-    df = df[df["started"] == True]
-
-    # Exclude injury exits
+    # One combined mask: starts only, optionally excluding injury exits and red cards
+    mask = (appearances["started"] == True).to_numpy()
     if exclude_injury:
-        df = df[df["injExit"] == False]
-
-    # Exclude red cards
+        mask &= (appearances["injExit"] == False).to_numpy()
     if exclude_red_card:
-        df = df[df["redCard"] == False]
+        mask &= (appearances["redCard"] == False).to_numpy()
 
-    # Sort by date descending (most recent first)
-    df = df.sort_values("date", ascending=False)
+    idx = np.flatnonzero(mask)
+    dates = appearances["date"].to_numpy()[idx]
 
-    # Limit to recency window
-    if recency_window > 0:
-        df = df.head(recency_window)
+    # Limit to recency window: select the latest dates in O(n), then sort
+    # only those (dates may be strings, so select from the top end rather
+    # than negating)
+    if 0 < recency_window < len(idx):
+        cut = len(idx) - recency_window
+        latest = np.argpartition(dates, cut)[cut:]
+        idx, dates = idx[latest], dates[latest]
 
-    return df
+    # Sort by date descending (most recent first)
+    return appearances.iloc[idx[np.argsort(dates, kind="stable")[::-1]]]
 
 def calculate_recency_weights(count: int) -> np.ndarray:
     """
@@ -47,13 +75,29 @@ def calculate_recency_weights(count: int) -> np.ndarray:
     if count == 0:
         return np.array([])
 
+    # Precomputed (read-only) for the usual window sizes
+    if count <= _MAX_RECENCY_WINDOW:
+        return _RECENCY_WEIGHTS[count - 1]
+
     # Exponential decay
-    alpha = 0.8
-    weights = np.array([alpha ** i for i in range(count)])
+    weights = RECENCY_ALPHA ** np.arange(count)
 
     # Normalize
     return weights / weights.sum()
 
+@njit(cache=True)
+def _role_lock(minutes: np.ndarray, threshold: int, minutes_threshold: float) -> bool:
+    """Compiled role-lock check over minutes ordered most recent first"""
+    if len(minutes) < threshold:
+        return False
+
+    for i in range(threshold):
+        # Written as "not >=" so a missing (NaN) minute breaks the lock
+        if not minutes[i] >= minutes_threshold:
+            return False
+
+    return True
+
 def detect_role_lock(
     healthy_starts: pd.DataFrame,
     threshold: int = 3,
@@ -62,14 +106,8 @@ def detect_role_lock(
     """
     Detect if player has role lock (consecutive high-minute starts)
     """
-    if len(healthy_starts) < threshold:
-        return False
-
-    # Check last N starts
-    recent = healthy_starts.head(threshold)
-
-    # All must be >= minutes_threshold
-    return all(recent["minutes"] >= minutes_threshold)
+    # Last N starts must all be >= minutes_threshold
+    return _role_lock(healthy_starts["minutes"].to_numpy(dtype=np.float64), threshold, float(minutes_threshold))
 
 def calculate_team_position_prior(
     team_appearances: pd.DataFrame,
@@ -140,9 +178,12 @@ def build_features_for_prediction(
 
     features["use_prior"] = False
 
+    # Minutes most recent first, extracted once for the numeric helpers
+    minutes = healthy_starts["minutes"].to_numpy(dtype=np.float64)
+
     # Recency-weighted minutes
-    weights = calculate_recency_weights(len(healthy_starts))
-    weighted_minutes = (healthy_starts["minutes"].values * weights).sum()
+    weights = calculate_recency_weights(len(minutes))
+    weighted_minutes = (minutes * weights).sum()
     features["weighted_avg_minutes"] = weighted_minutes
 
     # Recent performance
@@ -153,7 +194,7 @@ def build_features_for_prediction(
     features["minutes_std"] = healthy_starts["minutes"].std()
 
     # Role lock
-    features["role_lock"] = detect_role_lock(healthy_starts, threshold=3, minutes_threshold=85)
+    features["role_lock"] = _role_lock(minutes, 3, 85.0)
 
     # Start frequency
     all_recent = player_appearances.sort_values("date", ascending=False).head(recency_window)
@@ -190,64 +231,127 @@ def prepare_training_data(
     """
     Prepare training data from historical appearances
 
+    Every appearance is featurized in one vectorized pass from the player's
+    appearances on earlier dates, giving the same values as calling
+    build_features_for_prediction on that history.
+
     Returns:
         - stage_a_data: DataFrame for start probability model
         - stage_b_data: DataFrame for minutes-given-start model
     """
-    stage_a_records = []
-    stage_b_records = []
-
-    # Group by player
-    for player_id, player_apps in all_appearances.groupby("playerId"):
-        player_info = player_info_map.get(player_id, {})
-
-        # Sort by date
-        player_apps = player_apps.sort_values("date")
-
-        # For each appearance, build features from history before it
-        for idx, row in player_apps.iterrows():
-            # Get history before this appearance
-            history = player_apps[player_apps["date"] < row["date"]]
-
-            if len(history) < 3:  # Need minimum history
-                continue
-
-            # Build features
-            context = context_map.get(row["gameweek"], {})
-            depth = depth_map.get((player_id, row["gameweek"]), {})
-
-            features = build_features_for_prediction(
-                player_appearances=history,
-                player_info=player_info,
-                context=context,
-                depth_info=depth,
-                recency_window=8,
-            )
-
-            # Skip if using priors (not enough data)
-            if features.get("use_prior", False):
-                continue
-
-            # Stage A: Predict started (binary classification)
-            stage_a_record = {
-                **features,
-                "started": int(row["started"]),
-                "player_id": player_id,
-                "gameweek": row["gameweek"],
-            }
-            stage_a_records.append(stage_a_record)
-
-            # Stage B: Predict minutes given start (regression + survival)
-            if row["started"]:
-                # Exclude injury/red card from training
-                if not row["injExit"] and not row["redCard"]:
-                    stage_b_record = {
-                        **features,
-                        "minutes": row["minutes"],
-                        "full_90": int(row["minutes"] >= 90),
-                        "player_id": player_id,
-                        "gameweek": row["gameweek"],
-                    }
-                    stage_b_records.append(stage_b_record)
-
-    return pd.DataFrame(stage_a_records), pd.DataFrame(stage_b_records)
+    recency_window = 8
+
+    # Each player's appearances in date order, pulled out once as plain
+    # column arrays so everything below indexes numpy directly
+    df = all_appearances.sort_values(["playerId", "date"], kind="mergesort")
+    cols = {
+        col: df[col].to_numpy()
+        for col in ("playerId", "date", "gameweek", "minutes", "started", "injExit", "redCard")
+    }
+    player_ids = cols["playerId"]
+    n_rows = len(df)
+    row_idx = np.arange(n_rows)
+
+    # Offsets where each player, and each (player, date) block, begins
+    new_player = np.ones(n_rows, dtype=bool)
+    new_player[1:] = player_ids[1:] != player_ids[:-1]
+    new_block = new_player.copy()
+    new_block[1:] |= cols["date"][1:] != cols["date"][:-1]
+    player_start = np.maximum.accumulate(np.where(new_player, row_idx, 0))
+    block_start = np.maximum.accumulate(np.where(new_block, row_idx, 0))
+
+    # History of a row = the player's rows before its (player, date) block
+    history_len = block_start - player_start
+
+    # Healthy starts: started, no injury exit, no red card
+    healthy = (cols["started"] == True) & (cols["injExit"] == False) & (cols["redCard"] == False)
+    healthy_idx = np.flatnonzero(healthy)
+    healthy_players = player_ids[healthy_idx]
+    healthy_minutes = cols["minutes"][healthy_idx].astype(np.float64)
+
+    # Last `recency_window` healthy starts up to and including each healthy
+    # start, one column per lag (lag 0 is the most recent; NaN before the
+    # player's first start)
+    n_healthy = len(healthy_idx)
+    lags = np.full((n_healthy, recency_window), np.nan)
+    for lag in range(recency_window):
+        same_player = healthy_players[lag:] == healthy_players[:n_healthy - lag]
+        lags[lag:, lag] = np.where(same_player, healthy_minutes[:n_healthy - lag], np.nan)
+
+    present = ~np.isnan(lags)
+    filled = np.where(present, lags, 0.0)
+    counts = present.sum(axis=1)
+    weights = RECENCY_ALPHA ** np.arange(recency_window)
+    means = filled.sum(axis=1) / np.maximum(counts, 1)
+    sq_dev = np.where(present, (lags - means[:, None]) ** 2, 0.0).sum(axis=1)
+
+    stats = {
+        "weighted_avg_minutes": (filled @ weights) / (present @ weights),
+        "last_3_avg_minutes": filled[:, :3].sum(axis=1) / present[:, :3].sum(axis=1),
+        "last_5_avg_minutes": filled[:, :5].sum(axis=1) / present[:, :5].sum(axis=1),
+        "minutes_std": np.where(counts > 1, np.sqrt(sq_dev / np.maximum(counts - 1, 1)), np.nan),
+        "role_lock": (lags[:, :3] >= 85).all(axis=1),
+    }
+
+    # Healthy starts strictly before each row's block, capped at the window
+    healthy_before = np.cumsum(healthy) - healthy
+    num_healthy_starts = (healthy_before[block_start] - healthy_before[player_start]).clip(max=recency_window)
+
+    # Need minimum history, and skip rows that would fall back to priors
+    keep = (history_len >= 3) & (num_healthy_starts > 0)
+
+    # Each kept row reads the stats of the player's latest healthy start
+    # before its block
+    latest_healthy = np.maximum.accumulate(np.where(healthy, row_idx, -1))
+    stats_row = (np.cumsum(healthy) - 1)[latest_healthy[block_start[keep] - 1]]
+
+    # Context, depth and position lookups per unique key
+    gameweeks = cols["gameweek"][keep]
+    kept_players = player_ids[keep]
+    unique_gws, gw_inverse = np.unique(gameweeks, return_inverse=True)
+    gw_context = [context_map.get(gw, {}) for gw in unique_gws]
+    position_map = {"GK": 0, "DEF": 1, "MID": 2, "FWD": 3}
+    unique_players, player_inverse = np.unique(kept_players, return_inverse=True)
+    positions = np.array([
+        position_map.get(player_info_map.get(player_id, {})["position"], 2)
+        for player_id in unique_players
+    ], dtype=np.int64)
+
+    # Fill one preallocated record array column by column, wrapped once
+    features = np.empty(len(gameweeks), dtype=FEATURE_DTYPE)
+    features["num_healthy_starts"] = num_healthy_starts[keep]
+    features["has_data"] = True
+    features["use_prior"] = False
+    for col, values in stats.items():
+        features[col] = values[stats_row]
+    features["start_frequency"] = num_healthy_starts[keep] / np.minimum(history_len[keep], recency_window)
+    features["congestion_flag"] = np.array([c.get("congestionFlag", False) for c in gw_context], dtype=bool)[gw_inverse]
+    features["intl_window_flag"] = np.array([c.get("intlWindowFlag", False) for c in gw_context], dtype=bool)[gw_inverse]
+    features["avg_days_rest"] = np.array([c.get("avgDaysRestTeam", 7.0) for c in gw_context], dtype=np.float64)[gw_inverse]
+    features["viable_backups"] = [
+        depth_map.get(key, {}).get("viableBackupsCount", 2)
+        for key in zip(kept_players, gameweeks)
+    ]
+    features["position_encoded"] = positions[player_inverse]
+    features = pd.DataFrame(features)
+
+    # Stage A: Predict started (binary classification)
+    started = cols["started"][keep]
+    stage_a_data = features.assign(
+        started=started.astype(int),
+        player_id=kept_players,
+        gameweek=gameweeks,
+    )
+
+    # Stage B: Predict minutes given start (regression + survival),
+    # excluding injury/red card exits from training
+    stage_b_mask = started.astype(bool) & ~cols["injExit"][keep].astype(bool) & ~cols["redCard"][keep].astype(bool)
+    stage_b_minutes = cols["minutes"][keep][stage_b_mask]
+    stage_b_data = features[stage_b_mask].reset_index(drop=True).assign(
+        minutes=stage_b_minutes,
+        full_90=(stage_b_minutes >= 90).astype(int),
+        player_id=kept_players[stage_b_mask],
+        gameweek=gameweeks[stage_b_mask],
+    )
+
+    return stage_a_data, stage_b_data
@@ -4,13 +4,42 @@ Survival analysis using Cox proportional hazards or Weibull AFT
 Predicts minutes played and P90 for starters
 """
 
+import itertools
+import math
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from lifelines import CoxPHFitter, WeibullAFTFitter
 from lifelines.utils import concordance_index
 from typing import Dict, Optional, Tuple
-import pickle
+import joblib
+from joblib import Parallel, delayed
 import os
+import threading
+
+# skglm's Numba-compiled Cox solver (optional; lifelines when absent)
+try:
+    from skglm.estimators import CoxEstimator
+    HAS_SKGLM = True
+except ImportError:
+    HAS_SKGLM = False
+
+# Each fit or load takes a new token once all its parameters are assigned
+_fit_tokens = itertools.count()
+
+@lru_cache(maxsize=4096)
+def _cached_minutes(model: "MinutesGivenStartModel", fit_token: int, key: Tuple[float, ...]) -> Tuple[float, float]:
+    """
+    Memoized single-player (expected minutes, P90), keyed on the model's fit
+    token so entries computed for an earlier fit are never served
+    """
+    expected_minutes, p90 = model.predict_minutes(pd.DataFrame([key], columns=model.feature_names))
+
+    return float(expected_minutes[0]), float(p90[0])
+
+# Batches larger than this are split into row chunks scored on parallel threads
+# (the NumPy/pandas work releases the GIL); smaller batches run inline
+PREDICT_CHUNK_ROWS = 2048
 
 class MinutesGivenStartModel:
     """
@@ -18,14 +47,24 @@ class MinutesGivenStartModel:
     Uses survival analysis to model substitution hazard
     """
 
-    def __init__(self, model_type: str = "weibull"):
+    def __init__(self, model_type: str = "weibull", solver: str = "lifelines"):
         """
         Args:
             model_type: "cox" or "weibull"
+            solver: "lifelines", or "skglm" for a Numba-compiled Cox fit
         """
         self.model_type = model_type
-
-        if model_type == "cox":
+        self.solver = solver
+
+        if solver == "skglm":
+            if model_type != "cox":
+                raise ValueError("skglm solver only supports model_type='cox'")
+            if not HAS_SKGLM:
+                raise ImportError("skglm is not installed")
+            self.model = CoxEstimator(alpha=0.1, l1_ratio=0.0, method="breslow")
+        elif solver != "lifelines":
+            raise ValueError(f"Unknown solver: {solver}")
+        elif model_type == "cox":
             self.model = CoxPHFitter(penalizer=0.1)
         elif model_type == "weibull":
             self.model = WeibullAFTFitter(penalizer=0.1)
@@ -34,10 +73,24 @@ class MinutesGivenStartModel:
 
         self.feature_names = []
         self.is_trained = False
-
-    def prepare_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        self.concordance_index_ = None
+        self._fit_token = None
+
+        # Closed-form survival parameters, cached after fitting. Cox: coefficients
+        # on raw features, covariate means and the Breslow baseline cumulative
+        # hazard (plus its value at t=90). Weibull AFT: lambda coefficients,
+        # lambda intercept and the shape rho
+        self._beta = None
+        self._means = None
+        self._baseline_times = None
+        self._baseline_cum_hazard = None
+        self._h0_90 = None
+        self._lambda_intercept = None
+        self._rho = None
+
+    def _fit_feature_plan(self, data: pd.DataFrame):
         """
-        Prepare features for survival analysis
+        Fix the model's feature columns from the training data (training only)
         """
         feature_cols = [
             "num_healthy_starts",
@@ -57,19 +110,23 @@ class MinutesGivenStartModel:
         available_features = [col for col in feature_cols if col in data.columns]
         self.feature_names = available_features
 
-        df = data[available_features + ["minutes"]].copy()
-
-        # Fill NaN
-        df = df.fillna(0)
-
-        # Create event indicator (1 = subbed off, 0 = censored/played full time)
-        df["event"] = (df["minutes"] < 90).astype(int)
-
-        # For survival analysis, we model time-to-substitution
-        # Cap minutes at 90+ (censored)
-        df["duration"] = df["minutes"].clip(upper=95)
+    def prepare_features(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Prepare features for survival analysis
 
-        return df
+        Returns arrays (NaN -> 0): feature matrix "X", "duration" and "event"
+        """
+        X = data[self.feature_names].to_numpy(dtype=np.float64, na_value=0.0)
+        minutes = data["minutes"].to_numpy(dtype=np.float64, na_value=0.0)
+
+        return {
+            "X": X,
+            # Event indicator (1 = subbed off, 0 = censored/played full time)
+            "event": (minutes < 90).astype(np.int8),
+            # For survival analysis, we model time-to-substitution
+            # Cap minutes at 90+ (censored)
+            "duration": np.minimum(minutes, 95.0),
+        }
 
     def train(self, training_data: pd.DataFrame) -> Dict[str, any]:
         """
@@ -81,27 +138,111 @@ class MinutesGivenStartModel:
             raise ValueError("Insufficient training data (need at least 50 samples)")
 
         # Prepare data
-        df = self.prepare_features(training_data)
+        self._fit_feature_plan(training_data)
+        data = self.prepare_features(training_data)
 
         # Train model
-        self.model.fit(
-            df,
-            duration_col="duration",
-            event_col="event",
-        )
+        if self.solver == "skglm":
+            concordance, log_likelihood = self._fit_skglm(data["X"], data["duration"], data["event"])
+        else:
+            # lifelines takes a single frame of covariates, duration and event
+            df = pd.DataFrame(data["X"], columns=self.feature_names)
+            df["duration"] = data["duration"]
+            df["event"] = data["event"]
+
+            self.model.fit(
+                df,
+                duration_col="duration",
+                event_col="event",
+            )
+            concordance = self.model.concordance_index_
+            log_likelihood = self.model.log_likelihood_
+            self._cache_survival_params()
 
         self.is_trained = True
+        self.concordance_index_ = float(concordance)
+
+        # Features are small counts, averages and flags: the per-player affine
+        # terms are scored in float32 (the baseline hazard stays float64)
+        self._beta = self._beta.astype(np.float32)
+        if self._means is not None:
+            self._means = self._means.astype(np.float32)
+
+        # Memoized predictions belong to the previous fit: new key, old entries dropped
+        self._fit_token = next(_fit_tokens)
+        _cached_minutes.cache_clear()
 
         # Calculate metrics
         metrics = {
-            "concordance_index": float(self.model.concordance_index_),
-            "log_likelihood": float(self.model.log_likelihood_),
+            "concordance_index": float(concordance),
+            "log_likelihood": float(log_likelihood),
             "n_samples": len(training_data),
             "n_features": len(self.feature_names),
         }
 
         return metrics
 
+    def _fit_skglm(self, X: np.ndarray, duration: np.ndarray, event: np.ndarray) -> Tuple[float, float]:
+        """
+        Fit the L2-penalized Cox model with skglm and build the Breslow
+        baseline hazard lifelines would otherwise provide
+
+        Returns (concordance index, partial log-likelihood)
+        """
+        # Standardize as lifelines does, then fold the scale back into beta
+        self._means = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        self.model.fit((X - self._means) / scale, np.column_stack([duration, event]))
+        self._beta = self.model.coef_ / scale
+
+        # Breslow: H0(t) = sum over event times <= t of deaths / risk-set total
+        log_risk = (X - self._means) @ self._beta
+        times, inverse = np.unique(duration, return_inverse=True)
+        risk_per_time = np.bincount(inverse, weights=np.exp(log_risk))
+        events_per_time = np.bincount(inverse, weights=event)
+        at_risk = np.cumsum(risk_per_time[::-1])[::-1]
+
+        self._baseline_times = times
+        self._baseline_cum_hazard = np.cumsum(events_per_time / at_risk)
+        self._h0_90 = np.interp(90.0, times, self._baseline_cum_hazard)
+
+        log_likelihood = (event * log_risk).sum() - (events_per_time * np.log(at_risk)).sum()
+        concordance = concordance_index(duration, -log_risk, event)
+
+        return concordance, log_likelihood
+
+    def _cache_survival_params(self):
+        """
+        Pull the closed-form survival parameters out of the fitted lifelines model
+        """
+        if self.model_type == "cox":
+            self._beta = self.model.params_[self.feature_names].values
+            self._means = self.model._norm_mean[self.feature_names].values
+
+            baseline = self.model.baseline_cumulative_hazard_.iloc[:, 0]
+            self._baseline_times = baseline.index.values
+            self._baseline_cum_hazard = baseline.values
+            self._h0_90 = np.interp(90.0, self._baseline_times, self._baseline_cum_hazard)
+        else:
+            lambda_params = self.model.params_.loc["lambda_"]
+            self._beta = lambda_params[self.feature_names].values
+            self._lambda_intercept = float(lambda_params["Intercept"])
+            self._rho = float(np.exp(self.model.params_.loc[("rho_", "Intercept")]))
+
+    def _cox_median(self, risk: np.ndarray) -> np.ndarray:
+        """
+        Median minutes from S(t|x) = exp(-H0(t) * risk): the first baseline time
+        with S <= 0.5, i.e. H0(t) >= ln 2 / risk (infinite when never reached,
+        as in lifelines)
+        """
+        idx = np.searchsorted(self._baseline_cum_hazard, np.log(2) / risk, side="left")
+        median_times = np.full(len(risk), np.inf)
+        reached = idx < len(self._baseline_times)
+        median_times[reached] = self._baseline_times[idx[reached]]
+
+        return median_times
+
     def predict_minutes(self, features: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
         Predict expected minutes and P90
@@ -113,51 +254,61 @@ class MinutesGivenStartModel:
         if not self.is_trained:
             raise RuntimeError("Model not trained. Call train() first.")
 
-        df = features[self.feature_names].copy().fillna(0)
+        # Projection onto the trained columns with NaN -> 0 in one conversion
+        X = features.reindex(columns=self.feature_names).to_numpy(dtype=np.float32, na_value=0.0)
 
-        # Predict survival function for each player
-        if self.model_type == "cox":
-            # Cox model: use median survival time
-            median_times = self.model.predict_median(df).values
-            expected_minutes = np.clip(median_times, 0, 95)
-        else:
-            # Weibull AFT: use expected value
-            expected_minutes = self.model.predict_expectation(df).values
-            expected_minutes = np.clip(expected_minutes, 0, 95)
+        return self.predict_minutes_from_array(X)
 
-        # Calculate P90: probability of surviving past 90 minutes
-        p90_values = []
+    def predict_minutes_from_array(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict expected minutes and P90 for a raw (N, F) matrix already in
+        feature_names order with no NaNs, e.g. a buffer the caller allocates
+        once and refills in place across an optimization loop
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
 
-        for idx in range(len(df)):
-            row = df.iloc[idx:idx+1]
+        n_chunks = min(os.cpu_count() or 1, -(-len(X) // PREDICT_CHUNK_ROWS))
+        if n_chunks <= 1:
+            return self._predict_chunk(X)
 
-            # Get survival probability at t=90
-            surv_func = self.model.predict_survival_function(row)
+        results = Parallel(n_jobs=n_chunks, prefer="threads")(
+            delayed(self._predict_chunk)(chunk)
+            for chunk in np.array_split(X, n_chunks)
+        )
 
-            # Find survival probability at minute 90
-            if 90 in surv_func.index:
-                p90 = surv_func.loc[90].values[0]
-            else:
-                # Interpolate
-                surv_func = surv_func.sort_index()
-                if 90 < surv_func.index.min():
-                    p90 = 1.0
-                elif 90 > surv_func.index.max():
-                    p90 = surv_func.iloc[-1].values[0]
-                else:
-                    # Linear interpolation
-                    lower_idx = surv_func.index[surv_func.index <= 90][-1]
-                    upper_idx = surv_func.index[surv_func.index > 90][0]
-                    lower_val = surv_func.loc[lower_idx].values[0]
-                    upper_val = surv_func.loc[upper_idx].values[0]
+        return (
+            np.concatenate([expected_minutes for expected_minutes, _ in results]),
+            np.concatenate([p90 for _, p90 in results]),
+        )
+
+    def _predict_chunk(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Expected minutes and P90 for a block of feature rows
+        """
+        # Both stages are closed-form arithmetic over the whole block; no
+        # survival curves are built
+        if self.model_type == "cox":
+            risk = np.exp((X - self._means) @ self._beta)
+
+            # Cox model: use median survival time, found by binary search on
+            # the cached (sorted) baseline cumulative hazard for every player
+            median_times = self._cox_median(risk)
+            expected_minutes = np.clip(median_times, 0, 95)
+
+            # P90: S(90|x) = exp(-H0(90) * partial hazard)
+            p90 = np.exp(-self._h0_90 * risk)
+        else:
+            lambda_ = np.exp(X @ self._beta + self._lambda_intercept)
 
-                    # Interpolate
-                    weight = (90 - lower_idx) / (upper_idx - lower_idx)
-                    p90 = lower_val + weight * (upper_val - lower_val)
+            # Weibull AFT: use expected value, lambda(x) * Gamma(1 + 1/rho)
+            expected_minutes = lambda_ * math.gamma(1.0 + 1.0 / self._rho)
+            expected_minutes = np.clip(expected_minutes, 0, 95)
 
-            p90_values.append(p90)
+            # P90: S(90|x) = exp(-(90 / lambda(x)) ** rho)
+            p90 = np.exp(-((90.0 / lambda_) ** self._rho))
 
-        return expected_minutes, np.array(p90_values)
+        return expected_minutes, p90
 
     def predict_single(self, features: Dict[str, any]) -> Tuple[float, float]:
         """
@@ -167,53 +318,125 @@ class MinutesGivenStartModel:
             - expected_minutes: float
             - p90: float
         """
-        df = pd.DataFrame([features])
-        expected_minutes, p90 = self.predict_minutes(df)
+        # Memoized on the feature values since callers re-query the same player state
+        return _cached_minutes(self, self._fit_token, self._feature_key(features))
 
-        return float(expected_minutes[0]), float(p90[0])
+    def _feature_key(self, features: Dict[str, any]) -> Tuple[float, ...]:
+        """
+        Hashable feature vector in training order (missing/NaN -> 0, as fillna)
+        """
+        key = []
+        for name in self.feature_names:
+            value = features.get(name)
+            key.append(0.0 if value is None or value != value else float(value))
+
+        return tuple(key)
 
     def save(self, filepath: str):
         """Save model to disk"""
         model_data = {
             "model": self.model,
             "model_type": self.model_type,
+            "solver": self.solver,
             "feature_names": self.feature_names,
             "is_trained": self.is_trained,
+            "concordance_index": self.concordance_index_,
+            "beta": self._beta,
+            "means": self._means,
+            "baseline_times": self._baseline_times,
+            "baseline_cum_hazard": self._baseline_cum_hazard,
+            "h0_90": self._h0_90,
+            "lambda_intercept": self._lambda_intercept,
+            "rho": self._rho,
         }
 
-        with open(filepath, "wb") as f:
-            pickle.dump(model_data, f)
+        # Uncompressed joblib: numpy arrays are stored raw so load can memory-map them
+        joblib.dump(model_data, filepath)
 
     def load(self, filepath: str):
         """Load model from disk"""
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Model file not found: {filepath}")
 
-        with open(filepath, "rb") as f:
-            model_data = pickle.load(f)
+        # Arrays are paged in on demand instead of deserialized up front
+        # (plain pickles from older saves load the same way)
+        model_data = joblib.load(filepath, mmap_mode="r")
 
         self.model = model_data["model"]
         self.model_type = model_data["model_type"]
         self.feature_names = model_data["feature_names"]
         self.is_trained = model_data["is_trained"]
 
-# Global model instance
+        # Models saved before the skglm solver was added are lifelines fits
+        self.solver = model_data.get("solver", "lifelines")
+        self.concordance_index_ = model_data.get(
+            "concordance_index", getattr(self.model, "concordance_index_", None)
+        )
+        self._beta = model_data.get("beta")
+        self._means = model_data.get("means")
+        self._baseline_times = model_data.get("baseline_times")
+        self._baseline_cum_hazard = model_data.get("baseline_cum_hazard")
+        self._h0_90 = model_data.get("h0_90")
+        self._lambda_intercept = model_data.get("lambda_intercept")
+        self._rho = model_data.get("rho")
+
+        # Survival parameters are saved with the model; lifelines fits saved
+        # without them are re-derived from the fitted model
+        missing_params = self._rho is None if self.model_type == "weibull" else self._h0_90 is None
+        if self.is_trained and self.solver == "lifelines" and missing_params:
+            self._cache_survival_params()
+
+        self._fit_token = next(_fit_tokens)
+        _cached_minutes.cache_clear()
+
+# Global model instance, shared by all request threads. Nothing mutates it
+# once published: /train fits a fresh instance and reload_model loads one, and
+# both swap it in under the lock, so readers never see a half-trained or
+# half-loaded instance. The lock also serializes the first load
 _global_model = None
+_model_lock = threading.Lock()
+
+def _load_model() -> MinutesGivenStartModel:
+    """Build a model instance from the saved model on disk, if any"""
+    model = MinutesGivenStartModel(model_type="weibull")
+
+    # Try to load existing model
+    model_path = os.getenv("STAGE_B_MODEL_PATH", "models/minutes_given_start.pkl")
+    if os.path.exists(model_path):
+        try:
+            model.load(model_path)
+        except Exception as e:
+            print(f"Failed to load model: {e}")
+
+    return model
 
 def get_model() -> MinutesGivenStartModel:
     """Get or initialize the global model instance"""
     global _global_model
 
     if _global_model is None:
-        _global_model = MinutesGivenStartModel(model_type="weibull")
+        with _model_lock:
+            # Another thread may have finished loading while this one waited
+            if _global_model is None:
+                _global_model = _load_model()
+
+    return _global_model
+
+def reload_model() -> MinutesGivenStartModel:
+    """Load the model again from disk and swap it in for the cached one"""
+    global _global_model
+
+    with _model_lock:
+        _global_model = _load_model()
+
+    return _global_model
+
+def publish_model(model: MinutesGivenStartModel) -> MinutesGivenStartModel:
+    """Swap a fully trained model in for the cached one"""
+    global _global_model
 
-        # Try to load existing model
-        model_path = os.getenv("STAGE_B_MODEL_PATH", "models/minutes_given_start.pkl")
-        if os.path.exists(model_path):
-            try:
-                _global_model.load(model_path)
-            except Exception as e:
-                print(f"Failed to load model: {e}")
+    with _model_lock:
+        _global_model = model
 
     return _global_model
 
@@ -226,5 +449,5 @@ def get_model_info() -> Dict[str, any]:
         "model_type": model.model_type,
         "n_features": len(model.feature_names),
         "feature_names": model.feature_names,
-        "concordance_index": model.model.concordance_index_ if model.is_trained else None,
+        "concordance_index": model.concordance_index_ if model.is_trained else None,
     }
@@ -3,14 +3,48 @@ Stage A: Start Probability Model
 Logistic regression with regularization to predict if player starts
 """
 
+import itertools
+import json
+import math
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+from numba import njit
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import cross_val_score
+from sklearn.model_selection import StratifiedKFold, cross_val_score
 from typing import Dict, Optional, Tuple
-import pickle
+import joblib
 import os
+import threading
+
+@njit(cache=True)
+def _start_probability(x: np.ndarray, weights: np.ndarray, bias: float) -> float:
+    """Compiled sigmoid(x·w + b) for one player's raw feature vector"""
+    z = bias
+    for i in range(x.shape[0]):
+        z += x[i] * weights[i]
+    return 1.0 / (1.0 + math.exp(-z))
+
+def _linear_probability(X: np.ndarray, weights: np.ndarray, bias: float) -> np.ndarray:
+    """sigmoid(X·w + b) for a batch, evaluated in place in the logits buffer"""
+    logits = X @ weights
+    logits += bias
+    np.negative(logits, out=logits)
+    np.exp(logits, out=logits)
+    logits += 1.0
+    return np.reciprocal(logits, out=logits)
+
+# Each fit or load takes a new token once all its parameters are assigned
+_fit_tokens = itertools.count()
+
+@lru_cache(maxsize=4096)
+def _cached_start_probability(model: "StartProbabilityModel", fit_token: int, key: Tuple[float, ...]) -> float:
+    """
+    Memoized single-player score, keyed on the model's fit token so entries
+    computed for an earlier fit are never served after a refit or load
+    """
+    return _start_probability(np.array(key), model._weights, model._bias)
 
 class StartProbabilityModel:
     """
@@ -29,9 +63,14 @@ class StartProbabilityModel:
         self.feature_names = []
         self.is_trained = False
 
-    def prepare_features(self, data: pd.DataFrame) -> np.ndarray:
+        # Inference weights with the scaler folded in (set once trained)
+        self._weights = None
+        self._bias = 0.0
+        self._fit_token = None
+
+    def _fit_feature_plan(self, data: pd.DataFrame):
         """
-        Extract and scale features for model
+        Fix the model's feature columns from the training data (training only)
         """
         # Feature columns (exclude target and identifiers)
         feature_cols = [
@@ -53,9 +92,13 @@ class StartProbabilityModel:
         available_features = [col for col in feature_cols if col in data.columns]
         self.feature_names = available_features
 
-        X = data[available_features].fillna(0).values
+    def prepare_features(self, data: pd.DataFrame, dtype=np.float32) -> np.ndarray:
+        """
+        Extract features for model in trained column order (missing/NaN -> 0)
 
-        return X
+        Inference runs in float32; training asks for float64
+        """
+        return data.reindex(columns=self.feature_names).to_numpy(dtype=dtype, na_value=0.0)
 
     def train(self, training_data: pd.DataFrame) -> Dict[str, any]:
         """
@@ -67,7 +110,8 @@ class StartProbabilityModel:
             raise ValueError("Insufficient training data (need at least 50 samples)")
 
         # Prepare features and target
-        X = self.prepare_features(training_data)
+        self._fit_feature_plan(training_data)
+        X = self.prepare_features(training_data, dtype=np.float64)
         y = training_data["started"].values
 
         # Scale features
@@ -76,12 +120,16 @@ class StartProbabilityModel:
         # Train model
         self.model.fit(X_scaled, y)
         self.is_trained = True
+        self._fold_scaler()
 
         # Calculate metrics
         train_score = self.model.score(X_scaled, y)
 
-        # Cross-validation
-        cv_scores = cross_val_score(self.model, X_scaled, y, cv=5, scoring="roc_auc")
+        # Cross-validation (folds fit in parallel; the solver is single-threaded).
+        # Training rows arrive grouped by player, so folds are shuffled
+        # stratified draws rather than contiguous blocks
+        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+        cv_scores = cross_val_score(self.model, X_scaled, y, cv=cv, scoring="roc_auc", n_jobs=-1)
 
         metrics = {
             "train_accuracy": float(train_score),
@@ -103,6 +151,10 @@ class StartProbabilityModel:
             raise RuntimeError("Model not trained. Call train() first.")
 
         X = self.prepare_features(features)
+
+        if self._weights is not None:
+            return self.predict_from_array(X)
+
         X_scaled = self.scaler.transform(X)
 
         # Return probability of class 1 (started)
@@ -110,15 +162,59 @@ class StartProbabilityModel:
 
         return probs
 
+    def predict_from_array(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict start probability for a raw (N, F) matrix already in
+        feature_names order with no NaNs, e.g. a buffer the caller allocates
+        once and refills in place across an optimization loop
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        # Compiled path: P(started) = sigmoid(X·w + b), no pandas or sklearn
+        return _linear_probability(X, self._weights, self._bias)
+
+    def _fold_scaler(self):
+        """
+        Fold the StandardScaler into the logistic regression weights so
+        inference is one dot product and a sigmoid on raw features
+        """
+        weights = self.model.coef_[0] / self.scaler.scale_
+        self._bias = float(self.model.intercept_[0] - weights @ self.scaler.mean_)
+
+        # Features are small counts, averages and flags: float32 scoring moves
+        # half the bytes of float64 at ~1e-7 probability error
+        self._weights = weights.astype(np.float32)
+
+        # Memoized scores belong to the previous weights: new key, old entries dropped
+        self._fit_token = next(_fit_tokens)
+        _cached_start_probability.cache_clear()
+
     def predict_single(self, features: Dict[str, any]) -> float:
         """
         Predict start probability for a single player
         """
+        if self._weights is not None:
+            # Score in the compiled kernel (no DataFrame, no sklearn), memoized
+            # on the feature values since callers re-query the same player state
+            return _cached_start_probability(self, self._fit_token, self._feature_key(features))
+
         # Convert dict to DataFrame
         df = pd.DataFrame([features])
         probs = self.predict(df)
         return float(probs[0])
 
+    def _feature_key(self, features: Dict[str, any]) -> Tuple[float, ...]:
+        """
+        Hashable feature vector in training order (missing/NaN -> 0, as fillna)
+        """
+        key = []
+        for name in self.feature_names:
+            value = features.get(name)
+            key.append(0.0 if value is None or value != value else float(value))
+
+        return tuple(key)
+
     def get_feature_importance(self) -> Dict[str, float]:
         """
         Get feature importance (coefficients for logistic regression)
@@ -126,15 +222,29 @@ class StartProbabilityModel:
         if not self.is_trained:
             return {}
 
-        importance = dict(zip(self.feature_names, self.model.coef_[0]))
+        coef = self.model.coef_[0]
+
+        # Sort by absolute importance (stable argsort keeps ties in feature order)
+        order = np.argsort(-np.abs(coef), kind='stable')
+
+        return {self.feature_names[i]: float(coef[i]) for i in order}
+
+    def export_linear(self, filepath: str):
+        """
+        Write the scaler-folded linear model as JSON for FastStartPredictor
+        or any non-Python scorer: P(started) = sigmoid(x·weights + bias)
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
 
-        # Sort by absolute importance
-        importance = {
-            k: float(v)
-            for k, v in sorted(importance.items(), key=lambda x: abs(x[1]), reverse=True)
+        artifact = {
+            "features": self.feature_names,
+            "weights": self._weights.tolist(),
+            "bias": self._bias,
         }
 
-        return importance
+        with open(filepath, "w") as f:
+            json.dump(artifact, f)
 
     def save(self, filepath: str):
         """Save model to disk"""
@@ -143,41 +253,105 @@ class StartProbabilityModel:
             "scaler": self.scaler,
             "feature_names": self.feature_names,
             "is_trained": self.is_trained,
+            "weights": self._weights,
+            "bias": self._bias,
         }
 
-        with open(filepath, "wb") as f:
-            pickle.dump(model_data, f)
+        # Uncompressed joblib: numpy arrays are stored raw so load can memory-map them
+        joblib.dump(model_data, filepath)
 
     def load(self, filepath: str):
         """Load model from disk"""
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Model file not found: {filepath}")
 
-        with open(filepath, "rb") as f:
-            model_data = pickle.load(f)
+        # Arrays are paged in on demand instead of deserialized up front
+        # (plain pickles from older saves load the same way)
+        model_data = joblib.load(filepath, mmap_mode="r")
 
         self.model = model_data["model"]
         self.scaler = model_data["scaler"]
         self.feature_names = model_data["feature_names"]
         self.is_trained = model_data["is_trained"]
 
-# Global model instance
+        # Folded inference weights are saved with the model; older saves refold
+        self._weights = model_data.get("weights")
+        self._bias = model_data.get("bias", 0.0)
+
+        if self.is_trained and self._weights is None:
+            self._fold_scaler()
+
+        self._fit_token = next(_fit_tokens)
+        _cached_start_probability.cache_clear()
+
+class FastStartPredictor:
+    """
+    Stage A scorer built from an export_linear() artifact: NumPy only, no
+    sklearn objects to unpickle
+    """
+
+    def __init__(self, filepath: str):
+        with open(filepath, "r") as f:
+            artifact = json.load(f)
+
+        self.feature_names = artifact["features"]
+        self._weights = np.array(artifact["weights"], dtype=np.float32)
+        self._bias = float(artifact["bias"])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict start probability for an (N, F) feature matrix in feature_names order
+        """
+        return _linear_probability(np.asarray(X, dtype=np.float32), self._weights, self._bias)
+
+# Global model instance, shared by all request threads. Nothing mutates it
+# once published: /train fits a fresh instance and reload_model loads one, and
+# both swap it in under the lock, so readers never see a half-trained or
+# half-loaded instance. The lock also serializes the first load
 _global_model = None
+_model_lock = threading.Lock()
+
+def _load_model() -> StartProbabilityModel:
+    """Build a model instance from the saved model on disk, if any"""
+    model = StartProbabilityModel()
+
+    # Try to load existing model
+    model_path = os.getenv("STAGE_A_MODEL_PATH", "models/start_probability.pkl")
+    if os.path.exists(model_path):
+        try:
+            model.load(model_path)
+        except Exception as e:
+            print(f"Failed to load model: {e}")
+
+    return model
 
 def get_model() -> StartProbabilityModel:
     """Get or initialize the global model instance"""
     global _global_model
 
     if _global_model is None:
-        _global_model = StartProbabilityModel()
-
-        # Try to load existing model
-        model_path = os.getenv("STAGE_A_MODEL_PATH", "models/start_probability.pkl")
-        if os.path.exists(model_path):
-            try:
-                _global_model.load(model_path)
-            except Exception as e:
-                print(f"Failed to load model: {e}")
+        with _model_lock:
+            # Another thread may have finished loading while this one waited
+            if _global_model is None:
+                _global_model = _load_model()
+
+    return _global_model
+
+def reload_model() -> StartProbabilityModel:
+    """Load the model again from disk and swap it in for the cached one"""
+    global _global_model
+
+    with _model_lock:
+        _global_model = _load_model()
+
+    return _global_model
+
+def publish_model(model: StartProbabilityModel) -> StartProbabilityModel:
+    """Swap a fully trained model in for the cached one"""
+    global _global_model
+
+    with _model_lock:
+        _global_model = model
 
     return _global_model
 